@@ -1,8 +1,9 @@
 from haystack.indexes import *
 from haystack import site
+from searchqueue.indexes import QueuedSearchIndex
 from archive.models import Catalogue, Document
 
-class CatalogueIndex(SearchIndex):
+class CatalogueIndex(QueuedSearchIndex):
     text = CharField(document=True, use_template=True)
     pub_date = DateTimeField(model_attr='last_modified')
 
@@ -10,7 +11,7 @@ class CatalogueIndex(SearchIndex):
         """Used when the entire index for model is updated."""
         return Catalogue.objects.all()
 
-class DocumentIndex(SearchIndex):
+class DocumentIndex(QueuedSearchIndex):
     text = CharField(document=True, use_template=True)
     pub_date = DateTimeField(model_attr='last_modified')
 
@@ -5,8 +5,13 @@ It can also render the EnhancedTextField in the appropriate format or in HTML.
 
 """
        
+import threading
+from collections import OrderedDict
+
 from django.db import models
-from django.utils.encoding import force_unicode
+from django.core.cache import cache
+from django.utils.encoding import force_unicode, smart_str
+from django.utils.hashcompat import md5_constructor
 
 
 """FIX ME!!!
@@ -25,7 +30,8 @@ from django.utils.html import escape, urlize, linebreaks
 from django.contrib.markup.templatetags.markup import restructuredtext, markdown, textile
 from django.utils.safestring import mark_safe
 
-from enhancedtext.settings import DEFAULT_FORMAT, MARKDOWN_EXTENSIONS
+from enhancedtext.settings import DEFAULT_FORMAT, MARKDOWN_EXTENSIONS, \
+    RENDER_CACHE_SIZE, RENDER_CACHE_TIMEOUT
 
 CONTENT_FORMATS = (
     ('\P', _('Plain text')),
@@ -37,6 +43,103 @@ CONTENT_FORMATS = (
     ('\W', _('HTML editor')),  
 )
 
+# Formats whose output is the text itself and so are not worth caching.
+UNCACHED_FORMATS = ('\H', '\W')
+
+class RenderCache(object):
+    """Two tier cache for rendered EnhancedText output.
+
+    Rendered HTML is keyed by a hash of the text, its format and the Markdown
+    extensions in use. The first tier is a small least recently used cache in
+    the memory of each process. The second tier is the Django cache backend,
+    which is shared by all processes, so identical content is only converted
+    once per deployment.
+
+    The hits, shared_hits and misses counters can be inspected with stats().
+    """
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE,
+                 timeout=RENDER_CACHE_TIMEOUT):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.clear()
+
+    @staticmethod
+    def make_key(text, text_format):
+        return 'enhancedtext_' + md5_constructor(smart_str(text) + '|' +
+                    smart_str(text_format) + '|' +
+                    smart_str(MARKDOWN_EXTENSIONS)).hexdigest()
+
+    def _get_local(self, key):
+        self._lock.acquire()
+        try:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                # Reinserting moves the key to the most recently used end.
+                self._entries[key] = value
+                self.hits += 1
+            return value
+        finally:
+            self._lock.release()
+
+    def _set_local(self, key, value, counter):
+        """Stores value under key and adds one to the named counter, under
+        the same lock so that the counters stay exact with many threads.
+        """
+        self._lock.acquire()
+        try:
+            setattr(self, counter, getattr(self, counter) + 1)
+            if self.max_entries <= 0:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        finally:
+            self._lock.release()
+
+    def get_or_render(self, text, text_format, render):
+        """Returns the cached output for text in text_format, calling
+        render() to produce and cache it if it isn't cached yet.
+        """
+        key = self.make_key(text, text_format)
+
+        value = self._get_local(key)
+        if value is not None:
+            return value
+
+        if self.timeout:
+            value = cache.get(key)
+            if value is not None:
+                self._set_local(key, value, 'shared_hits')
+                return value
+
+        value = render()
+        self._set_local(key, value, 'misses')
+        if self.timeout:
+            cache.set(key, value, self.timeout)
+        return value
+
+    def stats(self):
+        return {'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'entries': len(self._entries)}
+
+    def clear(self):
+        """Empties the in-process tier and resets the counters. Entries in
+        the Django cache backend expire by themselves.
+        """
+        self._lock.acquire()
+        try:
+            self._entries = OrderedDict()
+            self.hits = self.shared_hits = self.misses = 0
+        finally:
+            self._lock.release()
+
+render_cache = RenderCache()
+
 class EnhancedText(object):
     """Python object that stores a unicode string and a one character field
     indicating the format of that string.  
@@ -79,11 +182,20 @@ class EnhancedText(object):
         
     def _output(self):   
         """It is this method that is responsible for rendering the 
-        object in HTML.
+        object in HTML. The output is looked up in, or added to, render_cache.
         """ 
         if self.text is None or self.text == "":
             return u""
-        
+
+        if self.text_format in UNCACHED_FORMATS:
+            return self._render()
+
+        return render_cache.get_or_render(self.text, self.text_format,
+                                          self._render)
+
+    def _render(self):
+        """Converts the text to HTML according to its format.
+        """
         if self.text_format == '\E':
             return linebreaks(urlize(escape(self.text)))
         elif self.text_format == '\T':
@@ -4,3 +4,12 @@ DEFAULT_FORMAT = "\W"
 
 MARKDOWN_EXTENSIONS = getattr(settings, 'ENHANCEDTEXT_MARKDOWN_EXTENSIONS', 
                         'abbr,tables,def_list,footnotes,urlize')
+
+# Number of rendered texts kept in each process's memory. Set to 0 to only
+# use the Django cache backend.
+RENDER_CACHE_SIZE = getattr(settings, 'ENHANCEDTEXT_RENDER_CACHE_SIZE', 500)
+
+# Time in SECONDS that rendered texts are kept in the Django cache backend.
+# Set to 0 to only use the in-process cache.
+RENDER_CACHE_TIMEOUT = getattr(settings, 'ENHANCEDTEXT_RENDER_CACHE_TIMEOUT',
+                               60 * 60 * 24)
@@ -7,6 +7,8 @@ Replace this with more appropriate tests for your application.
 
 from django.test import TestCase
 
+from enhancedtext.fields import EnhancedText, RenderCache, render_cache
+
 
 class SimpleTest(TestCase):
     def test_basic_addition(self):
@@ -14,3 +16,49 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class RenderCacheTest(TestCase):
+    def setUp(self):
+        render_cache.clear()
+
+    def test_render_once(self):
+        """
+        Tests that identical Markdown is only converted once.
+        """
+        first = EnhancedText("Some *emphasised* text\M")
+        second = EnhancedText("Some *emphasised* text\M")
+        self.assertEqual(first.output, second.output)
+        # The first lookup may be served by the shared Django cache
+        self.assertEqual(render_cache.misses + render_cache.shared_hits, 1)
+        self.assertEqual(render_cache.hits, 1)
+
+    def test_html_not_cached(self):
+        EnhancedText("<p>Some HTML</p>\H").output
+        self.assertEqual(render_cache.stats()['entries'], 0)
+
+    def test_least_recently_used_evicted(self):
+        rc = RenderCache(max_entries=2, timeout=0)
+        rc.get_or_render("a", "\M", lambda: "A")
+        rc.get_or_render("b", "\M", lambda: "B")
+        rc.get_or_render("a", "\M", lambda: "A")
+        rc.get_or_render("c", "\M", lambda: "C")
+        self.assertEqual(rc.get_or_render("a", "\M", lambda: "X"), "A")
+        self.assertEqual(rc.get_or_render("b", "\M", lambda: "X"), "X")
+
+    def test_counters_exact_with_threads(self):
+        import threading
+
+        rc = RenderCache(max_entries=10, timeout=0)
+
+        def render_many():
+            for i in range(200):
+                rc.get_or_render(str(i % 20), "\M", lambda: "X")
+
+        threads = [threading.Thread(target=render_many) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(rc.hits + rc.misses, 8 * 200)
+        self.assertEqual(rc.stats()['entries'], 10)
@@ -138,8 +138,11 @@ class SearchBackend(BaseSearchBackend):
             raise IOError("The path to your Xapian index '%s' is not writable for the current user/group." % settings.HAYSTACK_XAPIAN_PATH)
         
         self.language = language
+        self.stemmer = xapian.Stem(language)
+        self.commit_size = getattr(settings, 'HAYSTACK_XAPIAN_COMMIT_SIZE', 1000)
         self._schema = None
         self._content_field_name = None
+        self._fields = {}
         
     @property
     def schema(self):
@@ -153,7 +156,7 @@ class SearchBackend(BaseSearchBackend):
             self._content_field_name, self._schema = self.build_schema(self.site.all_searchfields())            
         return self._content_field_name
     
-    def update(self, index, iterable):
+    def update(self, index, iterable, commit_size=None):
         """
         Updates the `index` with any objects in `iterable` by adding/updating
         the database as needed.
@@ -162,6 +165,10 @@ class SearchBackend(BaseSearchBackend):
             `index` -- The `SearchIndex` to process
             `iterable` -- An iterable of model instances to index
         
+        Optional arguments:
+            `commit_size` -- Number of documents written between commits
+                             (default = `HAYSTACK_XAPIAN_COMMIT_SIZE`, or 1000)
+        
         For each object in `iterable`, a document is created containing all
         of the terms extracted from `index.full_prepare(obj)` with field prefixes, 
         and 'as-is' as needed.  Also, if the field type is 'text' it will be 
@@ -182,71 +189,81 @@ class SearchBackend(BaseSearchBackend):
         This is useful for querying for a specific document corresponding to
         a model instance.
         
-        The document also contains a pickled version of the object itself and
-        the document ID in the document data field.
+        The document data field holds a pickled tuple of the app label, model
+        name and pk of the object, and a dictionary of its stored fields.  An
+        index can list the fields to store in a `stored_fields` attribute;
+        otherwise every field but the document field is stored, as the
+        document field holds the whole text of the object and search results
+        load the object itself to display it.
         
         Finally, we also store field values to be used for sorting data.  We
         store these in the document value slots (position zero is reserver
         for the document ID).  All values are stored as unicode strings with
         conversion of float, int, double, values being done by Xapian itself
         through the use of the :method:xapian.sortable_serialise method.
+        
+        One term generator and stemmer are shared by all the documents, and
+        changes are committed every `commit_size` documents and at the end,
+        rather than left to Xapian's implicit flush.
         """
         database = self._database(writable=True)
+        fields, stored_fields = self._index_fields(index)
+        commit_size = commit_size or self.commit_size
+        
+        term_generator = xapian.TermGenerator()
+        term_generator.set_database(database)
+        term_generator.set_stemmer(self.stemmer)
+        if getattr(settings, 'HAYSTACK_INCLUDE_SPELLING', False) is True:
+            term_generator.set_flags(xapian.TermGenerator.FLAG_SPELLING)
+        
+        uncommitted = 0
         try:
             for obj in iterable:
                 document = xapian.Document()
-                
-                term_generator = xapian.TermGenerator()
-                term_generator.set_database(database)
-                term_generator.set_stemmer(xapian.Stem(self.language))
-                if getattr(settings, 'HAYSTACK_INCLUDE_SPELLING', False) is True:
-                    term_generator.set_flags(xapian.TermGenerator.FLAG_SPELLING)
                 term_generator.set_document(document)
                 
                 document_id = DOCUMENT_ID_TERM_PREFIX + get_identifier(obj)
                 data = index.full_prepare(obj)
-                weights = index.get_field_weights()
-                for field in self.schema:
-                    if field['field_name'] in data.keys():
-                        prefix = DOCUMENT_CUSTOM_TERM_PREFIX + field['field_name'].upper()
-                        value = data[field['field_name']]
-                        try:
-                            weight = int(weights[field['field_name']])
-                        except KeyError:
-                            weight = 1
-                        if field['type'] == 'text':
-                            if field['multi_valued'] == 'false':
-                                term = _marshal_term(value)
+                for field_name, prefix, weight, is_text, multi_valued, column in fields:
+                    if field_name not in data:
+                        continue
+                    value = data[field_name]
+                    if is_text:
+                        if not multi_valued:
+                            term = _marshal_term(value)
+                            term_generator.index_text(term, weight)
+                            term_generator.index_text(term, weight, prefix)
+                            if len(term.split()) == 1:
+                                document.add_term(term, weight)
+                                document.add_term(prefix + term, weight)
+                            document.add_value(column, _marshal_value(value))
+                        else:
+                            for term in value:
+                                term = _marshal_term(term)
                                 term_generator.index_text(term, weight)
                                 term_generator.index_text(term, weight, prefix)
                                 if len(term.split()) == 1:
                                     document.add_term(term, weight)
                                     document.add_term(prefix + term, weight)
-                                document.add_value(field['column'], _marshal_value(value))
-                            else:
-                                for term in value:
-                                    term = _marshal_term(term)
-                                    term_generator.index_text(term, weight)
-                                    term_generator.index_text(term, weight, prefix)
-                                    if len(term.split()) == 1:
-                                        document.add_term(term, weight)
-                                        document.add_term(prefix + term, weight)
+                    else:
+                        if not multi_valued:
+                            term = _marshal_term(value)
+                            if len(term.split()) == 1:
+                                document.add_term(term, weight)
+                                document.add_term(prefix + term, weight)
+                                document.add_value(column, _marshal_value(value))
                         else:
-                            if field['multi_valued'] == 'false':
-                                term = _marshal_term(value)
+                            for term in value:
+                                term = _marshal_term(term)
                                 if len(term.split()) == 1:
                                     document.add_term(term, weight)
                                     document.add_term(prefix + term, weight)
-                                    document.add_value(field['column'], _marshal_value(value))
-                            else:
-                                for term in value:
-                                    term = _marshal_term(term)
-                                    if len(term.split()) == 1:
-                                        document.add_term(term, weight)
-                                        document.add_term(prefix + term, weight)
                 
+                stored = dict(
+                    (name, data[name]) for name in stored_fields if name in data
+                )
                 document.set_data(pickle.dumps(
-                    (obj._meta.app_label, obj._meta.module_name, obj.pk, data),
+                    (obj._meta.app_label, obj._meta.module_name, obj.pk, stored),
                     pickle.HIGHEST_PROTOCOL
                 ))
                 document.add_term(document_id)
@@ -255,10 +272,67 @@ class SearchBackend(BaseSearchBackend):
                     (obj._meta.app_label, obj._meta.module_name)
                 )
                 database.replace_document(document_id, document)
+                
+                uncommitted += 1
+                if uncommitted >= commit_size:
+                    _commit(database)
+                    uncommitted = 0
         
         except UnicodeDecodeError:
             sys.stderr.write('Chunk failed.\n')
             pass
+        
+        if uncommitted:
+            _commit(database)
+    
+    def _index_fields(self, index):
+        """
+        Private method that returns a tuple of (fields, stored fields) for
+        documents of `index`.
+        
+        `fields` holds, for each field in the schema, a tuple of (field name,
+        term prefix, weight, is text, is multi-valued, value column).
+        `stored fields` lists the names of the fields kept in the document
+        data: those named in the index's `stored_fields` attribute, if it
+        has one, or all but the document field.
+        
+        These don't change between documents, so they are worked out once per
+        index and remembered.
+        """
+        try:
+            return self._fields[index]
+        except KeyError:
+            pass
+        
+        weights = index.get_field_weights()
+        fields = []
+        for field in self.schema:
+            try:
+                weight = int(weights[field['field_name']])
+            except KeyError:
+                weight = 1
+            fields.append((
+                field['field_name'],
+                DOCUMENT_CUSTOM_TERM_PREFIX + field['field_name'].upper(),
+                weight,
+                field['type'] == 'text',
+                field['multi_valued'] != 'false',
+                field['column'],
+            ))
+        
+        if getattr(index, 'stored_fields', None) is not None:
+            stored_fields = [
+                index.fields[name].index_fieldname for name in index.stored_fields
+            ]
+        else:
+            content_field = index.get_content_field()
+            stored_fields = [
+                field.index_fieldname for field in index.fields.values()
+                if field.index_fieldname != content_field
+            ]
+        
+        self._fields[index] = (fields, stored_fields)
+        return self._fields[index]
     
     def remove(self, obj):
         """
@@ -290,7 +364,12 @@ class SearchBackend(BaseSearchBackend):
             # Because there does not appear to be a "clear all" method,
             # it's much quicker to remove the contents of the `HAYSTACK_XAPIAN_PATH`
             # folder than it is to remove each document one at a time.
-            if os.path.exists(settings.HAYSTACK_XAPIAN_PATH):
+            if os.path.islink(settings.HAYSTACK_XAPIAN_PATH):
+                # A rebuilt index is reached through a link; empty its target
+                target = os.path.realpath(settings.HAYSTACK_XAPIAN_PATH)
+                shutil.rmtree(target)
+                os.mkdir(target)
+            elif os.path.exists(settings.HAYSTACK_XAPIAN_PATH):
                 shutil.rmtree(settings.HAYSTACK_XAPIAN_PATH)
         else:
             for model in models:
@@ -409,7 +488,7 @@ class SearchBackend(BaseSearchBackend):
         
         for match in matches:
             app_label, module_name, pk, model_data = pickle.loads(self._get_document_data(database, match.document))
-            if highlight:
+            if highlight and self.content_field_name in model_data:
                 model_data['highlighted'] = {
                     self.content_field_name: self._do_highlight(
                         model_data.get(self.content_field_name), query
@@ -1174,6 +1253,17 @@ class SearchQuery(BaseSearchQuery):
             return xapian.Query(xapian.Query.OP_PHRASE, term_list)
 
 
+def _commit(database):
+    """
+    Commits the pending changes to `database`. `commit` replaced `flush` in
+    Xapian 1.1.0.
+    """
+    if hasattr(database, 'commit'):
+        database.commit()
+    else:
+        database.flush()
+
+
 def _marshal_value(value):
     """
     Private utility method that converts Python values to a string for Xapian values.
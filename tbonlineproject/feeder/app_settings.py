@@ -0,0 +1,11 @@
+from django.conf import settings
+
+# Number of feeds downloaded at the same time by the getfeeds command
+FETCH_WORKERS = getattr(settings, 'FEEDER_FETCH_WORKERS', 8)
+
+# Seconds to wait on a feed's host before giving up on that feed
+FETCH_TIMEOUT = getattr(settings, 'FEEDER_FETCH_TIMEOUT', 20)
+
+# Seconds a feed's decoded entries stay cached. They are also dropped as soon
+# as the feed is refreshed.
+ITEMS_CACHE_TIMEOUT = getattr(settings, 'FEEDER_ITEMS_CACHE_TIMEOUT', 60 * 60)
@@ -0,0 +1,69 @@
+'''Downloads many feeds at once.
+
+Fetching is done by a bounded pool of threads, so one slow host only holds
+up one worker. The threads only download and parse (Feed.fetch()); the
+results are handed back to the calling thread, which does the database
+work (Feed.update_items()) while the remaining downloads carry on.
+'''
+
+import Queue
+import socket
+import sys
+import threading
+import time
+
+from feeder import app_settings
+
+class FetchResult(object):
+    '''The outcome of fetching one feed.
+    '''
+    def __init__(self, feed):
+        self.feed = feed
+        self.data = None
+        self.error = None
+        self.seconds = 0.0
+
+def _worker(jobs, results):
+    while True:
+        try:
+            result = jobs.get_nowait()
+        except Queue.Empty:
+            return
+        start = time.time()
+        try:
+            result.data = result.feed.fetch()
+        except:
+            result.error = sys.exc_info()[1]
+        result.seconds = time.time() - start
+        results.put(result)
+
+def fetch_feeds(feeds, workers=None, timeout=None):
+    '''Fetches feeds in parallel and yields a FetchResult for each, in the
+    order they finish.
+
+    timeout applies to every connection and read. feedparser has no timeout
+    argument, so it is set as the default socket timeout for the duration
+    of the run.
+    '''
+    feeds = list(feeds)
+    if workers is None:
+        workers = app_settings.FETCH_WORKERS
+    if timeout is None:
+        timeout = app_settings.FETCH_TIMEOUT
+
+    jobs = Queue.Queue()
+    for feed in feeds:
+        jobs.put(FetchResult(feed))
+    results = Queue.Queue()
+
+    old_timeout = socket.getdefaulttimeout()
+    socket.setdefaulttimeout(timeout)
+    try:
+        for i in range(max(1, min(workers, len(feeds)))):
+            thread = threading.Thread(target=_worker, args=(jobs, results))
+            thread.setDaemon(True)
+            thread.start()
+        for i in range(len(feeds)):
+            yield results.get()
+    finally:
+        socket.setdefaulttimeout(old_timeout)
@@ -1,11 +1,20 @@
 import sys
+import time
+from optparse import make_option
 
 from django.core.management.base import BaseCommand, CommandError
 from feeder.models import Feed
+from feeder.fetcher import fetch_feeds
 
 class Command(BaseCommand):
     args = '<slug slug ...>'
     help = 'Updates all active feeds, or specific feeds if any are specified'
+    option_list = BaseCommand.option_list + (
+        make_option('--workers', dest='workers', type='int', default=None,
+            help='Number of feeds to download at the same time'),
+        make_option('--timeout', dest='timeout', type='int', default=None,
+            help='Seconds to wait for a feed\'s host before giving up'),
+    )
 
     def handle(self, *args, **options):
         feeds = []
@@ -13,16 +22,45 @@ class Command(BaseCommand):
         if len(args):
             for feed_slug in args:
                 try:
-                    feeds += Feed.objects.get(slug=feed_slug)
+                    feeds.append(Feed.objects.get(slug=feed_slug))
                 except Feed.DoesNotExist:
                     raise CommandError('Feed "%s" does not exist' % feed_slug)
         else:
             feeds = Feed.objects.filter(active=True)
 
-        for feed in feeds:
+        start = time.time()
+        timings = []
+        updated = unchanged = failed = 0
+        for result in fetch_feeds(feeds, options.get('workers'),
+                                  options.get('timeout')):
+            feed = result.feed
+            timings.append((result.seconds, feed.slug))
             try:
-                feed.set_rss_items()
+                if result.error:
+                    raise result.error
+                changed = feed.update_items(result.data)
             except:
-                self.stdout.write('Error updating %s: %s %s\n' % (feed.slug, sys.exc_info()[0],sys.exc_info()[1]))
+                failed += 1
+                self.stdout.write('Error updating %s after %.2fs: %s %s\n' %
+                                  (feed.slug, result.seconds,
+                                   sys.exc_info()[0], sys.exc_info()[1]))
             else:
-                self.stdout.write('Successfully updated feed "%s"\n' % feed.slug)
+                if changed:
+                    updated += 1
+                    self.stdout.write('Successfully updated feed "%s" in '
+                                      '%.2fs\n' % (feed.slug, result.seconds))
+                else:
+                    unchanged += 1
+                    self.stdout.write('Feed "%s" not modified, checked in '
+                                      '%.2fs\n' % (feed.slug, result.seconds))
+
+        if timings:
+            timings.sort()
+            self.stdout.write('%d feeds in %.2fs: %d updated, %d not modified, '
+                              '%d failed. Fetch time mean %.2fs, median '
+                              '%.2fs, slowest %.2fs (%s)\n' %
+                              (len(timings), time.time() - start, updated,
+                               unchanged, failed,
+                               sum([t[0] for t in timings]) / len(timings),
+                               timings[len(timings) // 2][0],
+                               timings[-1][0], timings[-1][1]))
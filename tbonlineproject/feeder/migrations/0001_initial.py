@@ -0,0 +1,74 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding model 'Entry'
+        db.create_table('feeder_entry', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('feed', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['feeder.Feed'])),
+            ('title', self.gf('django.db.models.fields.CharField')(max_length=200)),
+            ('description', self.gf('django.db.models.fields.TextField')()),
+            ('link', self.gf('django.db.models.fields.URLField')(max_length=200)),
+            ('value', self.gf('django.db.models.fields.TextField')()),
+            ('last_modified', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
+            ('date_added', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
+        ))
+        db.send_create_signal('feeder', ['Entry'])
+
+        # Adding model 'Feed'
+        db.create_table('feeder_feed', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('title', self.gf('django.db.models.fields.CharField')(max_length=200)),
+            ('slug', self.gf('django.db.models.fields.SlugField')(unique=True, max_length=50, db_index=True)),
+            ('url', self.gf('django.db.models.fields.URLField')(max_length=200)),
+            ('active', self.gf('django.db.models.fields.BooleanField')(default=True)),
+            ('description', self.gf('django.db.models.fields.TextField')(blank=True)),
+            ('number_of_items', self.gf('django.db.models.fields.IntegerField')(default=5)),
+            ('position', self.gf('django.db.models.fields.IntegerField')(default=0)),
+            ('keep_old_items', self.gf('django.db.models.fields.BooleanField')(default=False)),
+        ))
+        db.send_create_signal('feeder', ['Feed'])
+
+
+    def backwards(self, orm):
+        
+        # Deleting model 'Entry'
+        db.delete_table('feeder_entry')
+
+        # Deleting model 'Feed'
+        db.delete_table('feeder_feed')
+
+
+    models = {
+        'feeder.entry': {
+            'Meta': {'ordering': "['feed', '-date_added']", 'object_name': 'Entry'},
+            'date_added': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'feed': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['feeder.Feed']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'link': ('django.db.models.fields.URLField', [], {'max_length': '200'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'value': ('django.db.models.fields.TextField', [], {})
+        },
+        'feeder.feed': {
+            'Meta': {'ordering': "['position']", 'object_name': 'Feed'},
+            'active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'keep_old_items': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'number_of_items': ('django.db.models.fields.IntegerField', [], {'default': '5'}),
+            'position': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '50', 'db_index': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '200'})
+        }
+    }
+
+    complete_apps = ['feeder']
@@ -0,0 +1,73 @@
+# encoding: utf-8
+import ast
+import datetime
+from south.db import db
+from south.v2 import DataMigration
+from django.db import models
+from django.utils import simplejson
+
+# Same as feeder.models.PAYLOAD_FIELDS when this migration was written
+PAYLOAD_FIELDS = ('title', 'link', 'description', 'author', 'published',
+                  'updated',)
+
+class Migration(DataMigration):
+
+    def forwards(self, orm):
+        "Converts entry payloads from Python literals to compact JSON."
+        Entry = orm['feeder.Entry']
+        for entry in Entry.objects.all().iterator():
+            try:
+                old = ast.literal_eval(entry.value)
+            except:
+                # Most payloads hold values such as time.struct_time that
+                # aren't literals; fall back to the entry's own columns
+                old = {'title': entry.title, 'link': entry.link,
+                       'description': entry.description}
+            if not isinstance(old, dict):
+                old = {}
+            value = dict([(field, unicode(old[field])) for field in
+                          PAYLOAD_FIELDS if old.get(field) is not None])
+            Entry.objects.filter(pk=entry.pk).update(
+                value=simplejson.dumps(value, separators=(',', ':')))
+
+
+    def backwards(self, orm):
+        "Converts entry payloads from JSON back to Python literals."
+        Entry = orm['feeder.Entry']
+        for entry in Entry.objects.all().iterator():
+            try:
+                value = simplejson.loads(entry.value)
+            except ValueError:
+                continue
+            Entry.objects.filter(pk=entry.pk).update(value=unicode(value))
+
+
+    models = {
+        'feeder.entry': {
+            'Meta': {'ordering': "['feed', '-date_added']", 'object_name': 'Entry'},
+            'date_added': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'feed': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['feeder.Feed']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'link': ('django.db.models.fields.URLField', [], {'max_length': '200', 'db_index': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'value': ('django.db.models.fields.TextField', [], {})
+        },
+        'feeder.feed': {
+            'Meta': {'ordering': "['position']", 'object_name': 'Feed'},
+            'active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'etag': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '200', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'keep_old_items': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'modified': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '64', 'blank': 'True'}),
+            'number_of_items': ('django.db.models.fields.IntegerField', [], {'default': '5'}),
+            'position': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '50', 'db_index': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '200'})
+        }
+    }
+
+    complete_apps = ['feeder']
@@ -1,18 +1,51 @@
 import ast
 import feedparser
 
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils import simplejson
 from django.utils.translation import ugettext_lazy as _
 
+from feeder import app_settings
+
+# The parts of a feedparser entry kept in Entry.value
+PAYLOAD_FIELDS = ('title', 'link', 'description', 'author', 'published',
+                  'updated',)
+
 class Entry(models.Model):
     feed = models.ForeignKey('Feed')
     title = models.CharField(max_length=200)
     description = models.TextField()
-    link = models.URLField(verify_exists=False)
+    link = models.URLField(verify_exists=False, db_index=True)
     value = models.TextField()
     last_modified = models.DateTimeField(auto_now=True, editable=False)
     date_added = models.DateTimeField(auto_now_add=True, editable=False)
 
+    @staticmethod
+    def make_value(entry):
+        '''Serializes the fields of a feedparser entry that are worth keeping
+        as compact JSON.
+        '''
+        value = {}
+        for field in PAYLOAD_FIELDS:
+            if entry.get(field) is not None:
+                value[field] = unicode(entry.get(field))
+        return simplejson.dumps(value, separators=(',', ':'))
+
+    def get_value(self):
+        '''Returns the stored payload as a dictionary, or None if it can't be
+        decoded.
+        '''
+        try:
+            return simplejson.loads(self.value)
+        except ValueError:
+            pass
+        try: # Stored as a Python literal before payloads were JSON
+            return ast.literal_eval(self.value)
+        except:
+            return None
+
     def __unicode__(self):
         return self.title
 
@@ -38,37 +71,95 @@ class Feed(models.Model):
                                 help_text=_('Determines position of this RSS feed '\
                                 'relative to others.'))
     keep_old_items = models.BooleanField(default=False)        
-    
-    def set_rss_items(self):
-        feed = feedparser.parse(self.url)
-        entries = feed["items"]
+    # HTTP validators from the last successful fetch, sent back to the server
+    # so that an unchanged feed costs a 304 response
+    etag = models.CharField(max_length=200, blank=True, default='',
+                            editable=False)
+    modified = models.CharField(max_length=64, blank=True, default='',
+                                editable=False)
+
+    def fetch(self):
+        '''Downloads and parses the feed, sending the stored ETag and
+        Last-Modified. Doesn't touch the database, so several feeds can be
+        fetched in parallel threads.
+        '''
+        return feedparser.parse(self.url, etag=self.etag or None,
+                                modified=self.modified or None)
+
+    @transaction.commit_on_success
+    def update_items(self, feed):
+        '''Stores the entries of a feed returned by fetch(), and its HTTP
+        validators. Returns False if the feed hasn't changed since the last
+        fetch.
+
+        Looks up the entries already stored in one query, then only adds the
+        new ones, updates the changed ones and, unless keep_old_items is set,
+        deletes the ones no longer in the feed.
+        '''
+        if feed.get('status') == 304:
+            return False
+        if 'status' not in feed and feed.get('bozo_exception'):
+            raise feed['bozo_exception']
+
+        # The newest entries, oldest first so that they are added in order
+        entries = feed["items"][:self.number_of_items]
+        entries.reverse()
+        links = [e.link for e in entries]
+
+        existing = dict([(e.link, e) for e in
+                         Entry.objects.filter(link__in=links)])
 
         if not self.keep_old_items:
-            Entry.objects.filter(feed__id=self.id).delete()
+            pruned = Entry.objects.filter(feed__id=self.id)
+            if links:
+                pruned = pruned.exclude(link__in=links)
+            pruned.delete()
 
-                
-        if len(entries) == 0:
-            return None
-        else:       
-            for i in range(min(len(entries)-1,self.number_of_items-1),-1,-1):
-                try:
-                    Entry.objects.get(link=entries[i].link)
-                except Entry.DoesNotExist:
-                    e = Entry()
-                    e.feed = self
-                    e.title = entries[i].title
-                    e.link = entries[i].link
-                    e.description = entries[i].description
-                    e.value = unicode(entries[i])
-                    e.save()
+        for entry in entries:
+            title, description = entry.title, entry.description
+            value = Entry.make_value(entry)
+            e = existing.get(entry.link)
+            if e is None:
+                e = Entry(feed=self, title=title, link=entry.link,
+                          description=description, value=value)
+                e.save()
+                existing[entry.link] = e
+            elif e.feed_id == self.id and (e.title, e.description, e.value) \
+                    != (title, description, value):
+                Entry.objects.filter(pk=e.pk).update(title=title,
+                        description=description, value=value)
+
+        # Only remember the validators once the entries are safely stored
+        headers = feed.get('headers', {})
+        self.etag = feed.get('etag', '')[:200]
+        self.modified = headers.get('last-modified',
+                                    headers.get('Last-Modified', ''))[:64]
+        Feed.objects.filter(pk=self.pk).update(etag=self.etag,
+                                               modified=self.modified)
+        cache.delete(Feed.items_cache_key(self.id))
+        return True
+
+    def set_rss_items(self):
+        return self.update_items(self.fetch())
         
+    @staticmethod
+    def items_cache_key(feed_id):
+        return 'feeder_items_%d' % feed_id
+
     def get_rss_items(self):
-        entries = Entry.objects.filter(feed__id=self.id)[0:self.number_of_items]
-        for e in entries: 
-            try:
-                e.value = ast.literal_eval(e.value)
-            except:
-                e.value = None
+        '''Returns the latest entries, with value replaced by the decoded
+        payload. The list is cached until the feed's entries change.
+        '''
+        cache_key = Feed.items_cache_key(self.id)
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == self.number_of_items:
+            return cached[1]
+        entries = list(Entry.objects.filter(feed__id=self.id)\
+                            [0:self.number_of_items])
+        for e in entries:
+            e.value = e.get_value()
+        cache.set(cache_key, (self.number_of_items, entries),
+                  app_settings.ITEMS_CACHE_TIMEOUT)
         return entries
 
     @models.permalink
@@ -83,3 +174,18 @@ class Feed(models.Model):
         verbose_name = _('RSS feed')
         verbose_name_plural = _('RSS feeds')
     
+
+
+def invalidate_rss_items(sender, instance, **kwargs):
+    '''Signal handler that drops a feed's cached entries when the feed or one
+    of its entries is edited or deleted.
+    '''
+    if isinstance(instance, Entry):
+        cache.delete(Feed.items_cache_key(instance.feed_id))
+    else:
+        cache.delete(Feed.items_cache_key(instance.id))
+
+post_save.connect(invalidate_rss_items, sender=Feed)
+post_delete.connect(invalidate_rss_items, sender=Feed)
+post_save.connect(invalidate_rss_items, sender=Entry)
+post_delete.connect(invalidate_rss_items, sender=Entry)
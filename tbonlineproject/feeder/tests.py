@@ -5,8 +5,56 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
+import threading
+import BaseHTTPServer
+
+import feedparser
+
 from django.test import TestCase
 
+from feeder.models import Feed, Entry
+from feeder.fetcher import fetch_feeds
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0">
+<channel>
+<title>Test feed</title>
+<link>http://example.com/</link>
+<description>Test feed</description>
+<item>
+<title>First item</title>
+<link>http://example.com/1</link>
+<description>The first item</description>
+</item>
+<item>
+<title>Second item</title>
+<link>http://example.com/2</link>
+<description>The second item</description>
+</item>
+</channel>
+</rss>
+"""
+
+class FeedHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    '''Serves RSS with an ETag, and 304 to requests that send it back.
+    '''
+    etag = '"v1"'
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml')
+        self.send_header('ETag', self.etag)
+        self.send_header('Last-Modified', 'Mon, 02 Jan 2012 10:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(RSS)
+
+    def log_message(self, *args):
+        pass
+
 
 class SimpleTest(TestCase):
     def test_basic_addition(self):
@@ -14,3 +62,87 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class FetcherTest(TestCase):
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), FeedHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.setDaemon(True)
+        thread.start()
+        url = 'http://127.0.0.1:%d/' % self.server.server_address[1]
+        self.feeds = [Feed.objects.create(title='Feed %d' % i,
+                                          slug='feed-%d' % i,
+                                          url=url + str(i))
+                      for i in range(3)]
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def testFetchFeeds(self):
+        results = list(fetch_feeds(self.feeds, workers=2, timeout=5))
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertEqual(result.error, None)
+            self.assertTrue(result.feed.update_items(result.data))
+
+        self.assertEqual(Entry.objects.count(), 2)
+        feed = Feed.objects.get(slug='feed-0')
+        self.assertEqual(feed.etag, '"v1"')
+        self.assertEqual(feed.modified, 'Mon, 02 Jan 2012 10:00:00 GMT')
+
+        # The stored ETag is sent back, so the server answers 304
+        for result in fetch_feeds(Feed.objects.all(), timeout=5):
+            self.assertEqual(result.data.get('status'), 304)
+            self.assertFalse(result.feed.update_items(result.data))
+        self.assertEqual(Entry.objects.count(), 2)
+
+    def testUnreachableFeedKeepsEntries(self):
+        feed = self.feeds[0]
+        feed.set_rss_items()
+        self.server.shutdown()
+        self.server.server_close()
+        result = list(fetch_feeds([feed], timeout=1))[0]
+        self.assertRaises(Exception, feed.update_items, result.data)
+        self.assertEqual(Entry.objects.filter(feed=feed).count(), 2)
+
+    def testUpdateItems(self):
+        feed = self.feeds[0]
+        feed.update_items(feedparser.parse(RSS))
+        first = Entry.objects.get(link='http://example.com/1')
+
+        rss = RSS.replace('http://example.com/2', 'http://example.com/3').\
+                  replace('The first item', 'The first item, corrected')
+        feed.update_items(feedparser.parse(rss))
+        self.assertEqual(sorted(Entry.objects.filter(feed=feed).\
+                                values_list('link', flat=True)),
+                         [u'http://example.com/1', u'http://example.com/3'])
+        entry = Entry.objects.get(link='http://example.com/1')
+        self.assertEqual(entry.pk, first.pk)
+        self.assertEqual(entry.description, u'The first item, corrected')
+
+        feed.keep_old_items = True
+        feed.update_items(feedparser.parse(RSS))
+        self.assertEqual(Entry.objects.filter(feed=feed).count(), 3)
+
+    def testEntryPayload(self):
+        feed = self.feeds[0]
+        feed.update_items(feedparser.parse(RSS))
+        entry = Entry.objects.get(link='http://example.com/1')
+        self.assertEqual(entry.get_value(),
+                         {u'title': u'First item',
+                          u'link': u'http://example.com/1',
+                          u'description': u'The first item'})
+
+        entry.value = unicode({'title': u'Old style payload'})
+        entry.save()
+        self.assertEqual(entry.get_value(), {'title': u'Old style payload'})
+
+        items = dict([(e.link, e) for e in feed.get_rss_items()])
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[u'http://example.com/1'].value,
+                         {'title': u'Old style payload'})
+
+        entry.delete()
+        self.assertEqual(len(feed.get_rss_items()), 1)
@@ -14,6 +14,7 @@ from credit.utils import credit_list
 
 from enhancedtext.fields import EnhancedTextField
 from copyright.models import Copyright
+from post.utils import get_unique_slug, save_with_unique_slug
 
 SIZES = (
     ('s', _('Small')),
@@ -55,22 +56,12 @@ class Image(models.Model):
     def _get_unique_slug(self):
         '''Makes slug unique, if it is not already, and returns it as a string.
         '''
-        slug_unique = False
-        counter = 1
-        slug = self.slug
-        
-        while not slug_unique: 
-            if self.id:
-                images = Image.objects.filter(slug=slug).\
-                    exclude(pk=self.id)
-            else:                
-                images = Image.objects.filter(slug=slug)
-            if len(images) == 0:
-                slug_unique = True
-            else:
-                slug = self.slug + "-" + unicode(counter)
-                counter += 1
-        return slug
+        return get_unique_slug(self)
+
+    def save(self, *args, **kwargs):
+        # Make the slug unique
+        save_with_unique_slug(self,
+                lambda: super(Image, self).save(*args, **kwargs))
         
     def get_credits(self):
         return credit_list(self.credits)
@@ -1,9 +1,10 @@
 import datetime
 from haystack.indexes import *
 from haystack import site
+from searchqueue.indexes import QueuedSearchIndex
 from gallery.models import Gallery, Image
 
-class GalleryIndex(SearchIndex):
+class GalleryIndex(QueuedSearchIndex):
     text = CharField(document=True, use_template=True)
     pub_date = DateTimeField(model_attr='last_modified')
 
@@ -11,7 +12,7 @@ class GalleryIndex(SearchIndex):
         """Used when the entire index for model is updated."""
         return Gallery.objects.all()
 
-class ImageIndex(SearchIndex):
+class ImageIndex(QueuedSearchIndex):
     text = CharField(document=True, use_template=True)
     pub_date = DateTimeField(model_attr='last_modified')
 
@@ -0,0 +1,79 @@
+'''Sends notification emails in batches over one reused connection.
+'''
+
+import sys
+import time
+
+from django.core.mail import get_connection
+
+from notifications import settings as app_settings
+
+class Dispatcher(object):
+    '''Sends email messages over a single mail connection, reopened every
+    batch_size messages. A message that fails is retried up to retries times
+    over a fresh connection before it is counted as failed, so one bad
+    message doesn't stop the others.
+
+    After send(), sent, failed and seconds hold the totals.
+    '''
+
+    def __init__(self, batch_size=None, retries=None, connection=None,
+                 stdout=None):
+        self.batch_size = batch_size or app_settings.BATCH_SIZE
+        if retries is None:
+            retries = app_settings.RETRIES
+        self.retries = retries
+        self.connection = connection or get_connection(fail_silently=False)
+        self.stdout = stdout or sys.stdout
+        self.sent = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    def _send_one(self, message):
+        for attempt in range(self.retries + 1):
+            try:
+                self.connection.send_messages([message])
+                return True
+            except:
+                error = sys.exc_info()
+                try:
+                    self.connection.close()
+                    self.connection.open()
+                except:
+                    pass
+        self.stdout.write('Error sending email to %s: %s %s\n' %
+                          (', '.join(message.to), error[0], error[1]))
+        return False
+
+    def send(self, messages, on_sent=None):
+        '''Sends an iterable of EmailMessages and returns the number sent.
+        on_sent, if given, is called with each message once it is sent.
+        '''
+        start = time.time()
+        sent = self.sent
+        in_batch = 0
+        try:
+            self.connection.open()
+            for message in messages:
+                if in_batch == self.batch_size:
+                    self.connection.close()
+                    self.connection.open()
+                    in_batch = 0
+                if self._send_one(message):
+                    self.sent += 1
+                    if on_sent:
+                        on_sent(message)
+                else:
+                    self.failed += 1
+                in_batch += 1
+        finally:
+            self.connection.close()
+            self.seconds += time.time() - start
+        return self.sent - sent
+
+    def report(self):
+        rate = 0.0
+        if self.seconds:
+            rate = self.sent / self.seconds
+        return 'Sent %d emails, %d failed, in %.2fs (%.1f emails/s)' % \
+               (self.sent, self.failed, self.seconds, rate)
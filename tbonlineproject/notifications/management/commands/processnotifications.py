@@ -1,8 +1,11 @@
 import sys
 from datetime import datetime
+from multiprocessing import Pool
+from optparse import make_option
 
 from django.core.management.base import BaseCommand
-from django.core.mail import send_mail
+from django.db import connection
+from django.core.mail import EmailMessage
 from django.contrib.sites.models import Site 
 from django.template import Context, Template, TemplateSyntaxError, \
     TemplateDoesNotExist, loader
@@ -11,106 +14,212 @@ from django.conf import settings
 from django.core.validators import email_re
 
 from notifications.models import Notification, Recipient
+from notifications.dispatch import Dispatcher
+from notifications import settings as app_settings
 
 def is_valid_email(email):
     return True if email_re.match(email) else False
 
+def process_notification(pk):
+    '''Entry point for worker processes.
+    '''
+    return Command().process_notification(pk)
+
 
 class Command(BaseCommand):
     args = '<notification_name notification_name ...>'
     help = 'Processes notification for the specified Notifications'
+    option_list = BaseCommand.option_list + (
+        make_option('--workers', dest='workers', type='int', default=1,
+            help='Number of processes sending notifications in parallel'),
+    )
 
-    def execute_notifications(self, names):
-        ''' Creates a dictionary called email_list in the following form:
-        
-        [{'notification': Notification,
-        'user' : user,
-        'site' : site,
-        'objects' : [o1, o2, o3 ... on],
-        
-        ''' 
+    def execute_notifications(self, names, workers=1):
+        '''Sends the emails of the named notifications, or of all active
+        notifications if no names are given, and returns the number of
+        emails processed.
+
+        With more than one worker the notifications are shared out among a
+        pool of processes. The total is the same as for a serial run.
+        '''
+        notifications = Notification.objects.active()
         if names:
-            notifications = Notification.objects.active().filter(name__in=names).select_subclasses()
+            notifications = notifications.filter(name__in=names)
+        pks = list(notifications.values_list('pk', flat=True))
+
+        if workers > 1 and len(pks) > 1:
+            # Each process must open its own database connection
+            connection.close()
+            pool = Pool(min(workers, len(pks)))
+            try:
+                counts = pool.map(process_notification, pks)
+            finally:
+                pool.close()
+                pool.join()
         else:
-            notifications = Notification.objects.active().select_subclasses()
+            counts = [self.process_notification(pk) for pk in pks]
+
+        total_emails_processed = sum(counts)
+        sys.stdout.write("Total emails processed: %d\n" % total_emails_processed)
         
-        self.email_list = {}
-    
-        total_emails_processed = 0
-    
-        for notification in notifications:
+        return total_emails_processed    
+
+    def process_notification(self, pk):
+        '''Sends the emails of one notification and returns the number
+        processed.
+
+        Recipients are checkpointed, in batches, as their emails are sent.
+        If a run stops part way, the next run carries on with the same
+        execution time, so it sees the same objects, and skips the
+        recipients already checkpointed. Each notification's objects are
+        queried once and shared by all its recipients, and recipients are
+        loaded in chunks, so memory use doesn't grow with the number of
+        subscribers.
+        '''
+        notification = Notification.objects.filter(pk=pk).select_subclasses()[0]
+        if notification.run_started:
+            execution_time = notification.run_started
+            sys.stdout.write('Resuming notification %s from %s\n' %
+                             (unicode(notification), unicode(execution_time)))
+        else:
             execution_time = datetime.now()
-            objects = notification.querydef()
-            
-            recipients = Recipient.objects.filter(notification__pk=notification.pk)
-            
-            context = {}
-            context['notification'] = notification
-            context['site'] = Site.objects.get_current()
-            context.update(notification.get_context_data())
-            
-            for r in recipients:
-                context['objects'] = []
-                for i, o in enumerate(objects):
+        # Objects added after the run started wait for the next run
+        objects = list(notification.querydef(until=execution_time))
+
+        processed = 0
+        if objects:
+            Notification.objects.filter(pk=pk).update(run_started=execution_time)
+            processed = self.send_mails(self.get_payloads(notification,
+                                        objects, execution_time),
+                                        execution_time)
+        
+        sys.stdout.write('Processed %d emails for notification: %s.\n' 
+                        % (processed, unicode(notification)))
                 
-                    if notification.is_digest: 
-                        context['objects'].append(o)
-                    else:
-                        context['objects'] = [o]
-                                        
-
-                context['user'] = r.user
-                if is_valid_email(r.user.email) and context['objects']:
-                    if notification.is_digest:
-                        self.email_list[r.user.email+notification.name] = context.copy()
-                    else:
-                        self.email_list[r.user.email+notification.name+unicode(i)] = context.copy()
-         
-            self.send_mails()
-            total_emails_processed += len(self.email_list)
-            
-            sys.stdout.write('Processed %d emails for notification: %s.\n' 
-                            % (len(self.email_list), unicode(notification)))
-                    
-            if len(objects):
-                notification.last_executed = execution_time
-                notification.save()
-                sys.stdout.write('Notification %s execution time %s written to database\n'
-                                  % (unicode(notification), unicode(execution_time)))
-            
-        sys.stdout.write("Total emails processed: %d\n" % total_emails_processed)
+        if len(objects):
+            notification.last_executed = execution_time
+            notification.run_started = None
+            notification.save()
+            sys.stdout.write('Notification %s execution time %s written to database\n'
+                              % (unicode(notification), unicode(execution_time)))
+        elif notification.run_started:
+            Notification.objects.filter(pk=pk).update(run_started=None)
         
-        return total_emails_processed    
+        return processed
 
     def handle(self, *args, **options):
         
         if len(args):        
-            self.execute_notifications(args)
-
-    def send_mails(self):
-        for key, context in self.email_list.iteritems():
-            from_email = settings.DEFAULT_FROM_EMAIL
-            to_email = context['user'].email
-            notification = context['notification']
-            
-            if notification.subject_template:
-                t = loader.get_template(notification.subject_template)
+            self.execute_notifications(args, options.get('workers') or 1)
+
+    def get_recipients(self, notification):
+        '''Yields the notification's recipients with their users, loading
+        them in chunks of RECIPIENT_CHUNK_SIZE.
+        '''
+        last_pk = 0
+        while True:
+            chunk = list(Recipient.objects.filter(
+                            notification__pk=notification.pk, pk__gt=last_pk).\
+                                select_related('user').order_by('pk')\
+                                    [:app_settings.RECIPIENT_CHUNK_SIZE])
+            if not chunk:
+                return
+            for recipient in chunk:
+                yield recipient
+            last_pk = chunk[-1].pk
+
+    def get_payloads(self, notification, objects, execution_time=None):
+        '''Yields (notification, recipient, objects, last) for each email to
+        send: one per recipient for a digest, otherwise one per recipient and
+        object. last is True for a recipient's last email. The objects list
+        is shared, never copied. Recipients already checkpointed for
+        execution_time are skipped.
+        '''
+        seen = set()
+        for recipient in self.get_recipients(notification):
+            user = recipient.user
+            if user is None or user.email in seen or \
+                    not is_valid_email(user.email):
+                continue
+            seen.add(user.email)
+            if execution_time and recipient.last_notified and \
+                    recipient.last_notified >= execution_time:
+                continue
+            if notification.is_digest:
+                yield notification, recipient, objects, True
             else:
-                t  = loader.get_template('notifications/notification_'+ 
-                                        notification.name.lower() +'_subject.txt')
-            
-            c = Context(context)
-            subject = t.render(c)
-                
-            if notification.body_template:
-                t = loader.get_template(notification.body_template)
-            else:  
-                t = loader.get_template('notifications/notification_'+ 
-                                        notification.name.lower() +'_email.txt')
-
-            c = Context(context)
-            body = t.render(c)
-            
-            send_mail(subject, body, from_email, [to_email], fail_silently=False)
-                
-            
\ No newline at end of file
+                for i, o in enumerate(objects):
+                    yield notification, recipient, [o], i == len(objects) - 1
+
+    def get_template(self, name):
+        '''Loads and compiles each template once per run.
+        '''
+        if not hasattr(self, 'templates'):
+            self.templates = {}
+        if name not in self.templates:
+            self.templates[name] = loader.get_template(name)
+        return self.templates[name]
+
+    def get_templates(self, notification):
+        '''Returns the compiled subject and body templates of a notification.
+        '''
+        prefix = 'notifications/notification_' + notification.name.lower()
+        return (self.get_template(notification.subject_template or
+                                  prefix + '_subject.txt'),
+                self.get_template(notification.body_template or
+                                  prefix + '_email.txt'))
+
+    def get_messages(self, payloads):
+        '''Yields an EmailMessage for each payload from get_payloads(). The
+        last message for each recipient carries the recipient's pk, for
+        checkpointing.
+        '''
+        from_email = settings.DEFAULT_FROM_EMAIL
+        contexts = {}
+        for notification, recipient, objects, last in payloads:
+            if notification.pk not in contexts:
+                contexts[notification.pk] = Context(dict(
+                    notification.get_context_data(),
+                    notification=notification,
+                    site=Site.objects.get_current()))
+            context = contexts[notification.pk]
+            subject_template, body_template = self.get_templates(notification)
+            context.update({'user': recipient.user, 'objects': objects})
+            try:
+                # Headers can't contain newlines
+                subject = u' '.join(subject_template.render(context).split())
+                body = body_template.render(context)
+            finally:
+                context.pop()
+            message = EmailMessage(subject, body, from_email,
+                                   [recipient.user.email])
+            message.recipient_pk = last and recipient.pk or None
+            yield message
+
+    def send_mails(self, payloads, execution_time=None):
+        '''Sends an email for each payload from get_payloads() over one mail
+        connection, and returns the number of emails processed. If
+        execution_time is given, each recipient is checkpointed with it once
+        all of its emails have been sent.
+        '''
+        checkpoints = []
+
+        def flush():
+            Recipient.objects.filter(pk__in=checkpoints).\
+                update(last_notified=execution_time)
+            del checkpoints[:]
+
+        def sent(message):
+            if execution_time and message.recipient_pk:
+                checkpoints.append(message.recipient_pk)
+                if len(checkpoints) >= app_settings.BATCH_SIZE:
+                    flush()
+
+        dispatcher = Dispatcher()
+        try:
+            dispatcher.send(self.get_messages(payloads), sent)
+        finally:
+            if checkpoints:
+                flush()
+        sys.stdout.write('%s.\n' % dispatcher.report())
+        return dispatcher.sent + dispatcher.failed
@@ -0,0 +1,150 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding model 'Notification'
+        db.create_table('notifications_notification', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('name', self.gf('django.db.models.fields.CharField')(max_length=200)),
+            ('content_type', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['contenttypes.ContentType'], null=True, blank=True)),
+            ('active', self.gf('django.db.models.fields.BooleanField')(default=True)),
+            ('is_digest', self.gf('django.db.models.fields.BooleanField')(default=True)),
+            ('subject_template', self.gf('django.db.models.fields.CharField')(max_length=200, blank=True)),
+            ('body_template', self.gf('django.db.models.fields.CharField')(max_length=200, blank=True)),
+            ('last_pk', self.gf('django.db.models.fields.PositiveIntegerField')(null=True, blank=True)),
+            ('last_executed', self.gf('django.db.models.fields.DateTimeField')()),
+            ('last_modified', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
+            ('date_added', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
+        ))
+        db.send_create_signal('notifications', ['Notification'])
+
+        # Adding model 'Recipient'
+        db.create_table('notifications_recipient', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('notification', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['notifications.Notification'])),
+            ('user', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['auth.User'], null=True, blank=True)),
+            ('last_modified', self.gf('django.db.models.fields.DateTimeField')(auto_now=True, blank=True)),
+            ('date_added', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
+        ))
+        db.send_create_signal('notifications', ['Recipient'])
+
+        # Adding unique constraint on 'Recipient', fields ['notification', 'user']
+        db.create_unique('notifications_recipient', ['notification_id', 'user_id'])
+
+        # Adding model 'PostNotification'
+        db.create_table('notifications_postnotification', (
+            ('notification_ptr', self.gf('django.db.models.fields.related.OneToOneField')(to=orm['notifications.Notification'], unique=True, primary_key=True)),
+        ))
+        db.send_create_signal('notifications', ['PostNotification'])
+
+        # Adding model 'CommentNotification'
+        db.create_table('notifications_commentnotification', (
+            ('notification_ptr', self.gf('django.db.models.fields.related.OneToOneField')(to=orm['notifications.Notification'], unique=True, primary_key=True)),
+            ('linked_content_type', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['contenttypes.ContentType'])),
+            ('linked_object_id', self.gf('django.db.models.fields.PositiveIntegerField')()),
+        ))
+        db.send_create_signal('notifications', ['CommentNotification'])
+
+        # Adding unique constraint on 'CommentNotification', fields ['linked_content_type', 'linked_object_id']
+        db.create_unique('notifications_commentnotification', ['linked_content_type_id', 'linked_object_id'])
+
+
+    def backwards(self, orm):
+        
+        # Removing unique constraint on 'CommentNotification', fields ['linked_content_type', 'linked_object_id']
+        db.delete_unique('notifications_commentnotification', ['linked_content_type_id', 'linked_object_id'])
+
+        # Removing unique constraint on 'Recipient', fields ['notification', 'user']
+        db.delete_unique('notifications_recipient', ['notification_id', 'user_id'])
+
+        # Deleting model 'Notification'
+        db.delete_table('notifications_notification')
+
+        # Deleting model 'Recipient'
+        db.delete_table('notifications_recipient')
+
+        # Deleting model 'PostNotification'
+        db.delete_table('notifications_postnotification')
+
+        # Deleting model 'CommentNotification'
+        db.delete_table('notifications_commentnotification')
+
+
+    models = {
+        'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        'auth.permission': {
+            'Meta': {'ordering': "('content_type__app_label', 'content_type__model', 'codename')", 'unique_together': "(('content_type', 'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['auth.Group']", 'symmetrical': 'False', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'notifications.commentnotification': {
+            'Meta': {'ordering': "('last_modified',)", 'unique_together': "(('linked_content_type', 'linked_object_id'),)", 'object_name': 'CommentNotification', '_ormbases': ['notifications.Notification']},
+            'linked_content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'linked_object_id': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'notification_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['notifications.Notification']", 'unique': 'True', 'primary_key': 'True'})
+        },
+        'notifications.notification': {
+            'Meta': {'ordering': "('last_modified',)", 'object_name': 'Notification'},
+            'active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'body_template': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']", 'null': 'True', 'blank': 'True'}),
+            'date_added': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_digest': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'last_executed': ('django.db.models.fields.DateTimeField', [], {}),
+            'last_modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'last_pk': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'subject_template': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'})
+        },
+        'notifications.postnotification': {
+            'Meta': {'ordering': "('last_modified',)", 'object_name': 'PostNotification', '_ormbases': ['notifications.Notification']},
+            'notification_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['notifications.Notification']", 'unique': 'True', 'primary_key': 'True'})
+        },
+        'notifications.recipient': {
+            'Meta': {'ordering': "('notification', 'user')", 'unique_together': "(('notification', 'user'),)", 'object_name': 'Recipient'},
+            'date_added': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'last_modified': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'notification': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['notifications.Notification']"}),
+            'user': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['auth.User']", 'null': 'True', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['notifications']
@@ -1,7 +1,9 @@
 from datetime import datetime
 import sys
 
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_save, post_delete
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ugettext
 from django.contrib.contenttypes.models import ContentType
@@ -13,6 +15,7 @@ from django.db import IntegrityError
 from model_utils.managers import InheritanceManager
 
 from post.models import BasicPost
+from notifications import settings as app_settings
 
 class AlreadyNotifiedError(Exception):
     """Exception raised when trying to add an existing user to a notification 
@@ -41,6 +44,8 @@ class Notification(models.Model):
     body_template = models.CharField(max_length=200, blank=True)    
     last_pk = models.PositiveIntegerField(blank=True, null=True) 
     last_executed = models.DateTimeField()
+    # Execution time of a run that hasn't finished, so it can be resumed
+    run_started = models.DateTimeField(blank=True, null=True, editable=False)
     last_modified = models.DateTimeField(auto_now=True, editable=False)
     date_added = models.DateTimeField(auto_now_add=True, editable=False)
 
@@ -78,15 +83,14 @@ class Notification(models.Model):
     def get_context_data(self):
         return {}
 
-    def querydef(self):
+    def querydef(self, until=None):
+        '''Returns the objects to notify recipients of: those added since
+        last_executed and, if until is given, no later than until.
+        '''
         return []
 
     def is_notified(self, name, user):
-        try:
-            Recipient.objects.get(notification__name=name, user=user)
-            return True
-        except Recipient.DoesNotExist:
-            return False
+        return name in get_subscriptions(user)
         
     
     def __unicode__(self):
@@ -99,6 +103,8 @@ class Notification(models.Model):
 class Recipient(models.Model):
     notification = models.ForeignKey(Notification)
     user = models.ForeignKey(User, null=True, blank=True)
+    # Execution time of the last run that emailed this recipient
+    last_notified = models.DateTimeField(blank=True, null=True, editable=False)
         
     last_modified = models.DateTimeField(auto_now=True, editable=False)
     date_added = models.DateTimeField(auto_now_add=True, editable=False)    
@@ -116,9 +122,12 @@ class PostNotification(Notification):
     def add_user(self, name, user, *args):
         return super(PostNotification, self).add_user(name, user, PostNotification)
     
-    def querydef(self):
-        return BasicPost.objects.published().\
-            filter(date_published__gte=self.last_executed).select_subclasses()
+    def querydef(self, until=None):
+        posts = BasicPost.objects.published().\
+            filter(date_published__gte=self.last_executed)
+        if until:
+            posts = posts.filter(date_published__lte=until)
+        return posts.select_subclasses()
 
 class CommentNotification(Notification):
     linked_content_type = models.ForeignKey(ContentType)
@@ -176,12 +185,15 @@ class CommentNotification(Notification):
         
         Recipient.objects.filter(notification=self, user__username=user).delete()
             
-    def querydef(self):
-        return Comment.objects.filter(content_type=self.linked_content_type, 
+    def querydef(self, until=None):
+        comments = Comment.objects.filter(content_type=self.linked_content_type, 
                                object_pk=self.linked_object_id, 
                                submit_date__gt=self.last_executed,
                                is_public=True,
                                is_removed=False)
+        if until:
+            comments = comments.filter(submit_date__lte=until)
+        return comments
 
                 
     def get_context_data(self):
@@ -191,16 +203,48 @@ class CommentNotification(Notification):
         return context
 
     def is_notified(self, name, user, obj):
-        try:
-            ct = ContentType.objects.get_for_model(obj)
-            self = CommentNotification.objects.get(name=name,
-                                linked_content_type=ct,
-                                linked_object_id=obj.pk)
-            Recipient.objects.get(notification__pk=self.pk, user=user)
-            return True
-        except (CommentNotification.DoesNotExist, Recipient.DoesNotExist):
-            return False
+        ct = ContentType.objects.get_for_model(obj)
+        return (name, ct.pk, obj.pk) in get_subscriptions(user)
     
     class Meta:
         unique_together = ('linked_content_type', 'linked_object_id')
+
+
+def subscriptions_cache_key(user_id):
+    return 'notifications_subscriptions_%d' % user_id
+
+def get_subscriptions(user):
+    '''Returns a frozenset of the names of the notifications the user
+    receives, plus a (name, content type id, object id) tuple for each
+    comment notification.
+
+    The set is cached per user and memoized on the user object, so checking
+    any number of notifications on a page costs at most one cache read.
+    '''
+    if not user.is_authenticated():
+        return frozenset()
+    if not hasattr(user, '_notification_subscriptions'):
+        cache_key = subscriptions_cache_key(user.pk)
+        subscriptions = cache.get(cache_key)
+        if subscriptions is None:
+            subscriptions = frozenset(
+                list(Recipient.objects.filter(user=user).
+                     values_list('notification__name', flat=True)) +
+                list(CommentNotification.objects.filter(recipient__user=user).
+                     values_list('name', 'linked_content_type',
+                                 'linked_object_id')))
+            cache.set(cache_key, subscriptions,
+                      app_settings.SUBSCRIPTIONS_CACHE_TIMEOUT)
+        user._notification_subscriptions = subscriptions
+    return user._notification_subscriptions
+
+def invalidate_subscriptions(sender, instance, **kwargs):
+    '''Signal handler that drops a user's cached subscriptions when one of
+    the user's Recipient rows is saved or deleted.
+    '''
+    if instance.user_id:
+        cache.delete(subscriptions_cache_key(instance.user_id))
+
+post_save.connect(invalidate_subscriptions, sender=Recipient)
+post_delete.connect(invalidate_subscriptions, sender=Recipient)
     
\ No newline at end of file
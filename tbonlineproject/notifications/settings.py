@@ -0,0 +1,16 @@
+from django.conf import settings
+
+# Number of emails sent over one SMTP connection before it is reopened
+BATCH_SIZE = getattr(settings, 'NOTIFICATIONS_BATCH_SIZE', 100)
+
+# Times a failed email is retried, over a fresh connection, before giving up
+RETRIES = getattr(settings, 'NOTIFICATIONS_RETRIES', 2)
+
+# Number of recipients loaded from the database at a time
+RECIPIENT_CHUNK_SIZE = getattr(settings, 'NOTIFICATIONS_RECIPIENT_CHUNK_SIZE',
+                               1000)
+
+# Seconds a user's set of subscriptions stays cached. It is also dropped as
+# soon as the user subscribes or unsubscribes.
+SUBSCRIPTIONS_CACHE_TIMEOUT = getattr(settings,
+                            'NOTIFICATIONS_SUBSCRIPTIONS_CACHE_TIMEOUT', 60 * 60)
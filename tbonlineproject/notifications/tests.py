@@ -5,8 +5,22 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
+import datetime
+from StringIO import StringIO
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.contrib.auth.models import User
+from django.contrib.sites.models import Site
 from django.test import TestCase
 
+from notifications.dispatch import Dispatcher
+from notifications.models import Notification, PostNotification, \
+    CommentNotification, Recipient, subscriptions_cache_key
+from post.models import BasicPost
+
 
 class SimpleTest(TestCase):
     def test_basic_addition(self):
@@ -14,3 +28,143 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class FlakyBackend(EmailBackend):
+    '''Fails the first time each message is sent.
+    '''
+    def __init__(self, *args, **kwargs):
+        super(FlakyBackend, self).__init__(*args, **kwargs)
+        self.attempts = {}
+        self.opened = 0
+
+    def open(self):
+        self.opened += 1
+
+    def send_messages(self, messages):
+        for message in messages:
+            self.attempts[message.to[0]] = self.attempts.get(message.to[0], 0) + 1
+            if self.attempts[message.to[0]] == 1 or message.to[0].startswith('bad'):
+                raise IOError('Connection lost')
+        return super(FlakyBackend, self).send_messages(messages)
+
+
+def make_messages(addresses):
+    for address in addresses:
+        yield EmailMessage('Subject', 'Body', 'tbonline@example.com', [address])
+
+
+class DispatcherTest(TestCase):
+
+    def testSend(self):
+        dispatcher = Dispatcher(batch_size=2)
+        addresses = ['user%d@example.com' % i for i in range(5)]
+        self.assertEqual(dispatcher.send(make_messages(addresses)), 5)
+        self.assertEqual([m.to[0] for m in mail.outbox], addresses)
+        self.assertEqual(dispatcher.failed, 0)
+
+    def testRetries(self):
+        connection = FlakyBackend()
+        dispatcher = Dispatcher(retries=1, connection=connection,
+                                stdout=StringIO())
+        self.assertEqual(dispatcher.send(make_messages(['good@example.com',
+                                                        'bad@example.com'])), 1)
+        self.assertEqual(dispatcher.failed, 1)
+        self.assertEqual(connection.attempts, {'good@example.com': 2,
+                                               'bad@example.com': 2})
+        self.assertEqual([m.to[0] for m in mail.outbox], ['good@example.com'])
+        self.assertTrue('1 failed' in dispatcher.report())
+
+
+class ProcessNotificationsTest(TestCase):
+
+    def setUp(self):
+        for i in range(2):
+            post = BasicPost.objects.create(title='Post %d' % i,
+                        slug='notification-%d' % i,
+                        date_published=datetime.datetime.now())
+            post.sites.add(Site.objects.get_current())
+        self.notification = PostNotification.objects.create(name='post',
+                        last_executed=datetime.datetime.now() -
+                                      datetime.timedelta(days=1))
+        for username, email in [('jane', 'jane@example.com'),
+                                ('joe', 'joe@example.com'),
+                                ('joe2', 'joe@example.com'),
+                                ('nobody', 'not an email')]:
+            user = User.objects.create(username=username, email=email)
+            Recipient.objects.create(notification=self.notification, user=user)
+
+    def execute(self):
+        from notifications.management.commands.processnotifications import Command
+        return Command().execute_notifications(['post'])
+
+    def testDigest(self):
+        self.assertEqual(self.execute(), 2)
+        self.assertEqual(sorted([m.to[0] for m in mail.outbox]),
+                         ['jane@example.com', 'joe@example.com'])
+        self.assertTrue('Post 0' in mail.outbox[0].body)
+        self.assertTrue('Post 1' in mail.outbox[0].body)
+
+    def testNotDigest(self):
+        self.notification.is_digest = False
+        self.notification.save()
+        self.assertEqual(self.execute(), 4)
+
+    def testResume(self):
+        now = datetime.datetime.now()
+        started = now - datetime.timedelta(hours=1)
+        BasicPost.objects.filter(slug__startswith='notification-').\
+            update(date_published=now - datetime.timedelta(hours=2))
+        # Published after the interrupted run started, so it waits
+        late = BasicPost.objects.create(title='Late post', slug='late',
+                        date_published=now - datetime.timedelta(minutes=30))
+        late.sites.add(Site.objects.get_current())
+        self.notification.run_started = started
+        self.notification.save()
+        Recipient.objects.filter(user__username='jane').update(last_notified=started)
+        self.assertEqual(self.execute(), 1)
+        self.assertEqual([m.to[0] for m in mail.outbox], ['joe@example.com'])
+        self.assertTrue('Post 0' in mail.outbox[0].body)
+        self.assertFalse('Late post' in mail.outbox[0].body)
+        notification = PostNotification.objects.get(pk=self.notification.pk)
+        self.assertEqual(notification.run_started, None)
+        self.assertEqual(notification.last_executed, started)
+        self.assertEqual(Recipient.objects.filter(last_notified=started).count(), 2)
+
+    def testResumeWithoutObjects(self):
+        BasicPost.objects.filter(slug__startswith='notification-').delete()
+        self.notification.run_started = datetime.datetime.now()
+        self.notification.save()
+        self.assertEqual(self.execute(), 0)
+        notification = PostNotification.objects.get(pk=self.notification.pk)
+        self.assertEqual(notification.run_started, None)
+
+
+class SubscriptionsTest(TestCase):
+
+    def setUp(self):
+        self.post = BasicPost.objects.create(title='Post', slug='subscriptions',
+                        date_published=datetime.datetime.now())
+        self.user = User.objects.create(username='jane', email='jane@example.com')
+        cache.delete(subscriptions_cache_key(self.user.pk))
+
+    def testSubscriptions(self):
+        notification = CommentNotification()
+        self.assertFalse(Notification().is_notified('post', self.user))
+        self.assertFalse(notification.is_notified('comment', self.user, self.post))
+        
+        PostNotification().add_user('post', self.user)
+        notification.add_user('comment', self.user, 'post', 'basicpost',
+                              self.post.pk)
+        # The set is memoized on the user, so a fresh user object sees changes
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(Notification().is_notified('post', user))
+        self.assertTrue(notification.is_notified('comment', user, self.post))
+        
+        self.assertNumQueries(0, notification.is_notified, 'comment', user,
+                              self.post)
+        
+        notification.remove_user(user.username, 'post', 'basicpost', self.post.pk)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(Notification().is_notified('post', user))
+        self.assertFalse(notification.is_notified('comment', user, self.post))
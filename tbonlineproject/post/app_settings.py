@@ -18,3 +18,13 @@ EMAIL_COMMENTS = getattr(settings, 'POST_EMAIL_COMMENTS', True)
 
 TRUNCATE_WORDS = getattr(settings, 'POST_TRUNCATE_WORDS', 95)
 
+
+CACHE_TIME = getattr(settings, 'CACHE_TIME', 10)
+
+FEATURED_POSTS = getattr(settings, 'POST_FEATURED_POSTS', 5)
+
+TAG_CLOUD_MIN_COUNT = getattr(settings, 'POST_TAG_CLOUD_MIN_COUNT', 8)
+
+# Kept short enough that counts adjusted by signals can't drift for long,
+# even if the rebuildtagcloud command isn't scheduled.
+TAG_CLOUD_TIMEOUT = getattr(settings, 'POST_TAG_CLOUD_TIMEOUT', 60 * 60 * 24)
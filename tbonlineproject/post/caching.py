@@ -0,0 +1,195 @@
+'''Generation counter for cached post pages, a view decorator that caches
+whole pages for anonymous visitors, and the cached tag usage counts behind
+the tag cloud.
+
+Every cache key built with make_key() contains the current generation. Saving
+or deleting a post increments the generation, so all the keys change at once
+and new posts appear immediately. Old entries are never read again and simply
+expire.
+'''
+
+import datetime
+import time
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.contrib.sites.models import Site
+from django.http import HttpResponse, HttpResponseNotModified
+from django.middleware.csrf import get_token
+from django.utils.encoding import smart_str
+from django.utils.functional import wraps
+from django.utils.hashcompat import md5_constructor
+from django.utils.http import http_date, parse_http_date_safe
+
+from post import app_settings
+
+GENERATION_KEY = 'post_generation'
+GENERATION_TIME_KEY = 'post_generation_time'
+
+# Thirty days, the longest relative timeout memcached accepts.
+GENERATION_TIMEOUT = 60 * 60 * 24 * 30
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = 1
+        cache.add(GENERATION_KEY, generation, GENERATION_TIMEOUT)
+    return generation
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError: # The key isn't in the cache
+        cache.set(GENERATION_KEY, 2, GENERATION_TIMEOUT)
+    cache.set(GENERATION_TIME_KEY, datetime.datetime.now(), GENERATION_TIMEOUT)
+
+def get_generation_time():
+    '''Returns when the generation was last incremented, or None if that
+    isn't known.
+    '''
+    return cache.get(GENERATION_TIME_KEY)
+
+TAG_COUNTS_KEY = 'post_tag_counts'
+
+def get_tag_counts(rebuild):
+    '''Returns the cached dictionary of tag name to number of posts tagged,
+    calling rebuild() to recount if it isn't in the cache.
+    '''
+    counts = cache.get(TAG_COUNTS_KEY)
+    if counts is None:
+        counts = rebuild()
+    return counts
+
+def set_tag_counts(counts):
+    cache.set(TAG_COUNTS_KEY, counts, app_settings.TAG_CLOUD_TIMEOUT)
+
+def adjust_tag_count(name, delta):
+    '''Adds delta to the cached count of a tag. Does nothing if the counts
+    aren't cached; the next read recounts them.
+    '''
+    counts = cache.get(TAG_COUNTS_KEY)
+    if counts is None:
+        return
+    count = counts.get(name, 0) + delta
+    if count > 0:
+        counts[name] = count
+    else:
+        counts.pop(name, None)
+    set_tag_counts(counts)
+
+def clear_tag_counts():
+    cache.delete(TAG_COUNTS_KEY)
+
+def make_key(prefix, *args):
+    '''Returns a cache key made of prefix, the current site, the current
+    generation and args.
+    '''
+    return '_'.join([prefix, unicode(Site.objects.get_current().id),
+                     unicode(get_generation())] +
+                    [unicode(a) for a in args])
+
+def _last_modified(response):
+    '''Returns the latest last_modified of the object or objects in the
+    context of a TemplateResponse, or None.
+    '''
+    context = getattr(response, 'context_data', None) or {}
+    obj = context.get('object')
+    if obj is not None:
+        return getattr(obj, 'last_modified', None)
+    dates = [getattr(o, 'last_modified', None)
+             for o in context.get('object_list') or []]
+    dates = [d for d in dates if d]
+    if dates:
+        return max(dates)
+    return None
+
+def _not_modified(request, response):
+    '''Returns True if the validators sent by the client match response.
+    '''
+    etag = request.META.get('HTTP_IF_NONE_MATCH')
+    if etag:
+        return etag == response.get('ETag')
+    since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+    if since and response.has_header('Last-Modified'):
+        since = parse_http_date_safe(since)
+        last_modified = parse_http_date_safe(response['Last-Modified'])
+        return since is not None and last_modified is not None and \
+            last_modified <= since
+    return False
+
+def _is_cacheable_request(request):
+    if request.method != 'GET':
+        return False
+    if hasattr(request, 'user') and request.user.is_authenticated():
+        return False
+    if len(messages.get_messages(request)):
+        return False
+    return True
+
+# Stands in for the CSRF token in cached pages
+CSRF_PLACEHOLDER = 'CSRF-TOKEN-PLACEHOLDER'
+
+def _fill_csrf_token(cached, request):
+    '''Returns a copy of a cached response with the requesting visitor's
+    CSRF token in place of CSRF_PLACEHOLDER. get_token() makes the CSRF
+    middleware send the visitor the matching cookie.
+    '''
+    token = get_token(request)
+    response = HttpResponse(cached.content.replace(CSRF_PLACEHOLDER, token),
+                            status=cached.status_code)
+    for header, value in cached.items():
+        response[header] = value
+    response['ETag'] = '"%s"' % md5_constructor(
+                            smart_str(cached['ETag'] + token)).hexdigest()
+    return response
+
+def cache_anonymous_response(prefix):
+    '''View decorator that caches whole rendered responses for anonymous GET
+    requests.
+
+    Keys are built with make_key(), so saving a post or a comment makes all
+    cached responses stale. Responses get ETag and Last-Modified headers, and
+    a 304 is returned when the client already has the current version.
+
+    One copy of each page is shared by all visitors. A CSRF token in the
+    page, e.g. in the comment form, is cached as a placeholder and replaced
+    with each visitor's own token when the page is served.
+    '''
+    def decorator(view):
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            path = md5_constructor(smart_str(request.get_full_path())).hexdigest()
+            cache_key = make_key('response_' + prefix, path)
+
+            response = cache.get(cache_key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.cookies:
+                    return response
+                if hasattr(response, 'render') and \
+                        not getattr(response, 'is_rendered', True):
+                    response.render()
+                token = None
+                if request.META.get('CSRF_COOKIE_USED'):
+                    token = request.META.get('CSRF_COOKIE')
+                    if not token:
+                        return response
+                    response.content = response.content.replace(token,
+                                                        CSRF_PLACEHOLDER)
+                last_modified = _last_modified(response)
+                if last_modified and not response.has_header('Last-Modified'):
+                    response['Last-Modified'] = http_date(
+                                    time.mktime(last_modified.timetuple()))
+                response['ETag'] = '"%s"' % \
+                    md5_constructor(smart_str(response.content)).hexdigest()
+                cache.set(cache_key, response, 60 * app_settings.CACHE_TIME)
+
+            if CSRF_PLACEHOLDER in response.content:
+                response = _fill_csrf_token(response, request)
+            if _not_modified(request, response):
+                return HttpResponseNotModified()
+            return response
+        return wraps(view)(wrapper)
+    return decorator
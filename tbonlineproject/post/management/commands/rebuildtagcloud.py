@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from post.models import BasicPost
+
+class Command(BaseCommand):
+    help = 'Recounts how often each tag is used on posts and caches the ' \
+           'counts for the tag cloud. Schedule it to correct any drift in ' \
+           'the counts kept up to date as posts are tagged.'
+
+    def handle(self, *args, **options):
+        counts = BasicPost.rebuild_tag_counts()
+        self.stdout.write('Counted %d tags used %d times\n' %
+                          (len(counts), sum(counts.values())))
@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from post.models import BasicPost
+
+class Command(BaseCommand):
+    args = '<id id ...>'
+    help = 'Recalculates the stored teaser, introduction and body of all ' \
+           'posts, or of specific posts if any ids are specified'
+
+    def handle(self, *args, **options):
+        posts = BasicPost.objects.all()
+
+        if len(args):
+            posts = posts.filter(pk__in=[int(a) for a in args])
+
+        count = 0
+        for post in posts.iterator():
+            try:
+                post.set_rendered_fields()
+                # Use update() so that last_modified and the slug are untouched
+                BasicPost.objects.filter(pk=post.pk).update(
+                    rendered_teaser=post.rendered_teaser,
+                    rendered_introduction=post.rendered_introduction,
+                    rendered_body=post.rendered_body)
+            except:
+                self.stdout.write('Error rendering post %d: %s %s\n' %
+                                  (post.pk, sys.exc_info()[0], sys.exc_info()[1]))
+            else:
+                count += 1
+
+        self.stdout.write('Rendered %d posts\n' % count)
@@ -36,7 +36,10 @@ current datetime.
 
 import datetime
 
+from django.conf import settings
 from django.db import models
+from django.db.models import Count
+from django.contrib import comments
 from django.contrib.auth.models import User
 from django.contrib.contenttypes import generic
 from django.contrib.contenttypes.models import ContentType
@@ -45,37 +48,103 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.comments.models import Comment
 from django.contrib.comments.moderation import CommentModerator, moderator
 from django.contrib.sites.models import Site
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 from sorl.thumbnail import ImageField
 from sorl.thumbnail import get_thumbnail
-from model_utils.managers import InheritanceManager
+from model_utils.managers import InheritanceManager, InheritanceQuerySet
 
 from tagging.models import TaggedItem, Tag
 
 from credit.utils import credit_list
 
 from copyright.models import Copyright
-from credit.models import Credit, OrderedCredit
+from credit.models import OrderedCredit
 from gallery.models import Gallery, Image
 from categories.models import Category
 from enhancedtext.fields import EnhancedTextField
 from post import app_settings
+from post import caching
+from post.utils import get_unique_slug, save_with_unique_slug
+
+class PostQuerySet(InheritanceQuerySet):
+    '''select_subclasses() without arguments resolves each post's class from
+    its stored post_type instead of joining every subclass table. The posts
+    are fetched without joins, then each subclass's posts are fetched with
+    one query, much like model_utils' InheritanceCastMixin.cast().
+
+    Naming subclasses explicitly still gives model_utils' joins.
+    '''
+
+    def select_subclasses(self, *subclasses):
+        if subclasses:
+            return super(PostQuerySet, self).select_subclasses(*subclasses)
+        new_qs = self._clone()
+        new_qs.by_post_type = True
+        return new_qs
+
+    def _clone(self, klass=None, setup=False, **kwargs):
+        if getattr(self, 'by_post_type', False):
+            kwargs['by_post_type'] = True
+        return super(PostQuerySet, self)._clone(klass, setup, **kwargs)
+
+    def iterator(self):
+        if not getattr(self, 'by_post_type', False):
+            for obj in super(PostQuerySet, self).iterator():
+                yield obj
+            return
+
+        posts = list(super(PostQuerySet, self).iterator())
+        basic_post_type = ContentType.objects.get_for_model(BasicPost).id
+        type_to_pks = {}
+        untyped = []
+        for post in posts:
+            if post.post_type_id is None:
+                untyped.append(post.pk)
+            elif post.post_type_id != basic_post_type:
+                type_to_pks.setdefault(post.post_type_id, []).append(post.pk)
+
+        pk_to_child = {}
+        for post_type_id, pks in type_to_pks.iteritems():
+            cls = BasicPost.get_post_class(post_type_id)
+            pk_to_child.update(cls._default_manager.in_bulk(pks))
+        if untyped:
+            # Posts saved before post_type existed need the joins
+            for child in InheritanceQuerySet(BasicPost).filter(pk__in=untyped).\
+                    select_subclasses():
+                pk_to_child[child.pk] = child
+
+        for post in posts:
+            yield pk_to_child.get(post.pk, post)
 
 class PostManager(InheritanceManager):
     '''Uses model_utils 3rd party Django library to implement methods to get
     published or unpublished posts.
     '''
 
+    def get_query_set(self):
+        return PostQuerySet(self.model)
+
     def published(self):
-        return super(PostManager, self).get_query_set().filter(
+        return self.get_query_set().filter(
                 date_published__lte=datetime.datetime.now(),
                     sites__id=Site.objects.get_current().id)
 
     def unpublished(self):
-        return super(PostManager, self).get_query_set().\
+        return self.get_query_set().\
                 filter(sites__id=Site.objects.get_current().id). \
                     exclude(date_published__lte=datetime.datetime.now())
 
+    def featured(self, limit=None):
+        '''Returns the published featured posts, most recent first, as their
+        correct inherited types. Uses the (featured, date_published) index.
+        '''
+        posts = self.published().filter(featured=True).\
+                    order_by('-date_published').select_subclasses()
+        if limit:
+            posts = posts[:limit]
+        return posts
+
 class SubmittedArticle(models.Model):
     submitted_by = models.ForeignKey(User)
     submitted_on = models.DateTimeField(auto_now_add=True)
@@ -182,8 +251,23 @@ class BasicPost(models.Model):
     sites = models.ManyToManyField(Site)
     tags = generic.GenericRelation(TaggedItem, verbose_name=_('tags'),
                                       blank=True, null=True)
+
+    # Denormalized output of get_teaser_intro_body(), calculated in save() so
+    # that list and detail pages don't have to render and split the body on
+    # every request.
+    rendered_teaser = models.TextField(blank=True, editable=False)
+    rendered_introduction = models.TextField(blank=True, editable=False)
+    rendered_body = models.TextField(blank=True, editable=False)
+
+    # The content type of the class this post really is, set on the first
+    # save, so that get_class() doesn't have to query each subclass table.
+    post_type = models.ForeignKey(ContentType, blank=True, null=True,
+                                  editable=False, related_name='basicposts')
+
     objects = PostManager()
 
+    _subclasses = None
+
     def __get_template__(self, template_name, list_or_detail):
         '''Determines the template name for rendering a post and returns it as
         a string.
@@ -219,6 +303,34 @@ class BasicPost(models.Model):
         '''
         return credit_list(self.authors)
 
+    def get_author_list(self):
+        '''Returns the post's ordered credits with their credits loaded. Uses
+        the list attached by prefetch_meta() if there is one.
+        '''
+        if not hasattr(self, '_author_list'):
+            self._author_list = list(self.authors.select_related('credit'))
+        return self._author_list
+
+    def get_tag_list(self):
+        '''Returns the post's tags. Uses the list attached by prefetch_meta()
+        if there is one.
+        '''
+        if not hasattr(self, '_tag_list'):
+            self._tag_list = [item.tag for item in
+                              self.tags.select_related('tag')]
+        return self._tag_list
+
+    def get_comment_count(self):
+        '''Returns the number of comments the get_comment_count template tag
+        would count. Uses the count attached by prefetch_meta() if there is
+        one.
+        '''
+        if not hasattr(self, '_comment_count'):
+            self._comment_count = BasicPost._public_comments(
+                        [ContentType.objects.get_for_model(self)],
+                        [self.pk]).count()
+        return self._comment_count
+
     def get_teaser_intro_body(self):
         '''Calculates the teaser, intro and body for this post
 
@@ -249,6 +361,22 @@ class BasicPost(models.Model):
               11. 000y: Intro tag set. Set teaser to intro and body to
                         remainder.
 
+        The result is remembered on the instance until one of the three fields
+        changes, so repeated calls to get_teaser(), get_introduction() and
+        get_body() only render and split the text once.
+        '''
+
+        source = (self.teaser.to_string(), self.introduction.to_string(),
+                  self.body.to_string())
+
+        if getattr(self, '_teaser_intro_body_source', None) != source:
+            self._teaser_intro_body = self._split_teaser_intro_body()
+            self._teaser_intro_body_source = source
+
+        return self._teaser_intro_body
+
+    def _split_teaser_intro_body(self):
+        '''Does the work for get_teaser_intro_body().
         '''
 
         # Simplest case - they've all been set by the user
@@ -320,6 +448,13 @@ class BasicPost(models.Model):
     def get_body(self):
         return self.get_teaser_intro_body()[2]
 
+    def set_rendered_fields(self):
+        '''Stores the teaser, introduction and body calculated by
+        get_teaser_intro_body() in the rendered_* fields. Called by save().
+        '''
+        self.rendered_teaser, self.rendered_introduction, self.rendered_body = \
+            [unicode(s) for s in self.get_teaser_intro_body()]
+
     def describe(self):
         '''Describe methods are used by several apps in the system to return a
         description of themselves.
@@ -327,7 +462,7 @@ class BasicPost(models.Model):
         Some templates depend on this method existing to produce sensible
         output.
         '''
-        return self.get_introduction()
+        return self.rendered_introduction or self.get_introduction()
 
     def is_published(self):
         '''A post is published if the date-time is > date_published.
@@ -350,18 +485,40 @@ class BasicPost(models.Model):
     def get_subclasses():
         '''Determines all the subclasses of BasicPost, even new user defined
         ones.
+
+        The subclasses can't change once the models are loaded, so they are
+        only calculated on the first call.
+        '''
+        if BasicPost._subclasses is None:
+            BasicPost._subclasses = [rel for rel in
+                    BasicPost._meta.get_all_related_objects()
+                    if isinstance(rel.field, models.OneToOneField) and
+                        issubclass(rel.field.model, BasicPost)]
+        return BasicPost._subclasses
+
+    @staticmethod
+    def get_post_class(post_type_id):
+        '''Returns the post class for the content type id stored in post_type.
+
+        ContentType caches its lookups by id, so this normally doesn't touch
+        the database.
         '''
-        return [rel for rel in BasicPost._meta.get_all_related_objects()
-                if isinstance(rel.field, models.OneToOneField) and
-                    issubclass(rel.field.model, BasicPost)]
+        return ContentType.objects.get_for_id(post_type_id).model_class()
 
     def get_class(self):
         '''Will return the type of self unless this is a BasicPost in which case
-        it will try to see if there's a subclass and return that.
+        it will use post_type to find the subclass this post really is.
 
-        If that fails. return BasicPost.
+        Posts saved before post_type existed fall back to checking each
+        subclass in turn. If that fails. return BasicPost.
         '''
-        if isinstance(self, BasicPost):
+        if type(self) != BasicPost:
+            return type(self)
+
+        if self.post_type_id:
+            return BasicPost.get_post_class(self.post_type_id)
+
+        if self.pk:
             for cls in BasicPost.get_subclasses():
                 try:
                     inst = getattr(self, cls.var_name)
@@ -369,9 +526,17 @@ class BasicPost(models.Model):
                         return type(inst)
                 except ObjectDoesNotExist:
                     pass
-            return BasicPost
-        else:
-            return type(self)
+        return BasicPost
+
+    def as_subclass(self):
+        '''Returns this post as an instance of its real class. Only the tables
+        of that class are queried, unlike select_subclasses() which joins the
+        tables of every subclass.
+        '''
+        cls = self.get_class()
+        if cls == type(self):
+            return self
+        return cls.objects.get(pk=self.pk)
 
     def get_class_name(self):
         return self.get_class().__name__
@@ -392,7 +557,6 @@ class BasicPost(models.Model):
         For example, if the Post is a PostWithImage, then the PostWithImage
         admin change screen must open, not the BasicPost change screen.
         '''
-        cls = self.get_class()
         return ('admin:post_'+ self.get_class().__name__.lower() +'_change',
                     [str(self.pk)])
 
@@ -410,103 +574,166 @@ class BasicPost(models.Model):
     render_admin_url.admin_order_field = 'id'
 
     @staticmethod
-    def get_posts_by_tags_union(tags):
-        '''Returns all posts which contain any of the tags in the list of tags
-        passed as an argument to this method.
-        '''
-
-        if type(tags) == str or type(tags) == unicode:
-            tags = tags.rsplit(",")
-
-        if type(tags) != list:
-            raise TypeError("Tags is a %s. Expected tags to be a list, string"
-                            " or unicode object."  % unicode(type(tags)))
+    def get_post_content_types():
+        '''Returns the content types of BasicPost and all its subclasses.
 
-        posts = []
+        Tags, credits and comments can point at a post through any of these.
+        '''
+        return [ContentType.objects.get_for_model(cls) for cls in
+                [BasicPost] + [rel.model for rel in BasicPost.get_subclasses()]]
 
-        for t in tags:
-            try:
-                tag = Tag.objects.get(name=t)
-            except Tag.DoesNotExist:
-                continue
+    @staticmethod
+    def _public_comments(content_types, object_ids):
+        '''Returns the comments on the given objects, filtered the same way
+        as the comments framework's template tags filter them.
+        '''
+        model = comments.get_model()
+        queryset = model.objects.filter(content_type__in=content_types,
+                        object_pk__in=[unicode(i) for i in object_ids],
+                        site__pk=settings.SITE_ID)
+        field_names = [f.name for f in model._meta.fields]
+        if 'is_public' in field_names:
+            queryset = queryset.filter(is_public=True)
+        if getattr(settings, 'COMMENTS_HIDE_REMOVED', True) and \
+                'is_removed' in field_names:
+            queryset = queryset.filter(is_removed=False)
+        return queryset
 
-            posts_for_this_tag = list(TaggedItem.objects.\
-                                      get_by_model(BasicPost, tag))
-            for cls in BasicPost.get_subclasses():
-                posts_for_this_tag += list(TaggedItem.objects.\
-                                           get_by_model(cls.model, tag))
+    @staticmethod
+    def prefetch_meta(posts):
+        '''Loads the authors, tags and comment counts of a list of posts in
+        three queries, instead of three per post, and attaches them to the
+        posts for get_author_list(), get_tag_list() and get_comment_count().
 
+        Returns the posts as a list.
+        '''
+        posts = list(posts)
+        if not posts:
+            return posts
+        by_key = {}
+        for post in posts:
+            post._author_list = []
+            post._tag_list = []
+            post._comment_count = 0
+            by_key[(ContentType.objects.get_for_model(post).pk, post.pk)] = post
+        content_types = set([key[0] for key in by_key])
+        ids = set([key[1] for key in by_key])
+
+        for credit in OrderedCredit.objects.filter(
+                    content_type__in=content_types, object_id__in=ids).\
+                    select_related('credit'):
+            post = by_key.get((credit.content_type_id, credit.object_id))
+            if post is not None:
+                post._author_list.append(credit)
+
+        for item in TaggedItem.objects.filter(
+                    content_type__in=content_types, object_id__in=ids).\
+                    select_related('tag'):
+            post = by_key.get((item.content_type_id, item.object_id))
+            if post is not None:
+                post._tag_list.append(item.tag)
+
+        for row in BasicPost._public_comments(content_types, ids).\
+                    order_by().values('content_type', 'object_pk').\
+                    annotate(count=Count('pk')):
+            post = by_key.get((row['content_type'], int(row['object_pk'])))
+            if post is not None:
+                post._comment_count = row['count']
 
-            posts += filter(lambda p: p.is_published() and \
-                Site.objects.get_current() in p.sites.all(), posts_for_this_tag)
+        return posts
 
-        return list(set(posts)) # Remove duplicates
+    @staticmethod
+    def rebuild_tag_counts():
+        '''Counts how many posts of any type use each tag, in one query, and
+        caches the counts for the tag cloud.
+        '''
+        counts = dict([(row['tag__name'], row['count']) for row in
+                       TaggedItem.objects.filter(
+                            content_type__in=BasicPost.get_post_content_types()).\
+                            order_by().values('tag__name').\
+                            annotate(count=Count('pk'))])
+        caching.set_tag_counts(counts)
+        return counts
 
     @staticmethod
-    def get_posts_by_tags_intersection(tags):
-        '''Returns all posts that have all the tags in the list of tags passed
-        in the argument to this method.
+    def get_tag_counts():
+        '''Returns a dictionary of tag name to number of posts tagged with it,
+        from the cache if possible.
         '''
+        return caching.get_tag_counts(BasicPost.rebuild_tag_counts)
 
+    @staticmethod
+    def _tags_to_list(tags):
         if type(tags) == str or type(tags) == unicode:
             tags = tags.rsplit(",")
+
         if type(tags) != list:
             raise TypeError("Tags is a %s. Expected tags to be a list, string"
                             " or unicode object."  % unicode(type(tags)))
+        return tags
 
-        posts = set([])
-        for i, t in enumerate(tags):
-            try:
-                tag = Tag.objects.get(name=t)
-            except Tag.DoesNotExist:
-                continue
+    @staticmethod
+    def _tagged_post_ids(**kwargs):
+        '''Returns an unevaluated query of the ids of posts with tags matching
+        kwargs, for use as a subquery.
+        '''
+        return TaggedItem.objects.filter(
+                    content_type__in=BasicPost.get_post_content_types(),
+                    **kwargs).values('object_id')
 
-            posts_for_this_tag = list(TaggedItem.objects.\
-                                      get_by_model(BasicPost, tag))
-            for cls in BasicPost.get_subclasses():
-                posts_for_this_tag += list(TaggedItem.objects.\
-                                           get_by_model(cls.model, tag))
+    @staticmethod
+    def get_posts_by_tags_union(tags):
+        '''Returns all published posts on the current site which contain any
+        of the tags in the list of tags passed as an argument to this method.
 
-            posts_for_this_tag = set(filter(lambda p: p.is_published() and \
-                        Site.objects.get_current() in \
-                            p.sites.all(), posts_for_this_tag))
+        The result is a queryset, most recent first, so it can be sliced and
+        paginated in the database.
+        '''
+        tags = BasicPost._tags_to_list(tags)
 
-            if i > 0:
-                posts = posts & posts_for_this_tag
-            else:
-                posts = posts_for_this_tag
+        return BasicPost.objects.published().\
+                filter(pk__in=BasicPost._tagged_post_ids(tag__name__in=tags)).\
+                    distinct().order_by('-date_published').select_subclasses()
 
-        return list(posts)
+    @staticmethod
+    def get_posts_by_tags_intersection(tags):
+        '''Returns all published posts on the current site that have all the
+        tags in the list of tags passed in the argument to this method.
+
+        Tags that don't exist are ignored. The result is a queryset, most
+        recent first.
+        '''
+        tags = BasicPost._tags_to_list(tags)
+
+        tag_ids = Tag.objects.filter(name__in=tags).values_list('id', flat=True)
+        if not tag_ids:
+            return BasicPost.objects.none()
+
+        posts = BasicPost.objects.published()
+        for tag_id in tag_ids:
+            posts = posts.filter(pk__in=BasicPost._tagged_post_ids(tag__id=tag_id))
+
+        return posts.distinct().order_by('-date_published').select_subclasses()
 
     def _get_unique_slug(self):
         '''Makes slug unique, if it is not already, and returns it as a string.
         '''
-        slug_unique = False
-        counter = 1
-        slug = self.slug
-
-        while not slug_unique:
-            if self.pk:
-                posts = BasicPost.objects.filter(slug=slug).\
-                    exclude(pk=self.pk)
-            else:
-                posts = BasicPost.objects.filter(slug=slug)
-            if len(posts) == 0:
-                slug_unique = True
-            else:
-                slug = self.slug + "-" + unicode(counter)
-                counter += 1
-        return slug
+        return get_unique_slug(self, queryset=BasicPost.objects.all())
 
     def save(self, *args, **kwargs):
+        self.set_rendered_fields()
+        if not self.post_type_id:
+            self.post_type = ContentType.objects.get_for_model(self.get_class())
         # Make the slug unique
-        self.slug = self._get_unique_slug()
-        super(BasicPost, self).save(*args, **kwargs)
+        save_with_unique_slug(self,
+                lambda: super(BasicPost, self).save(*args, **kwargs),
+                queryset=BasicPost.objects.all())
 
 
     @staticmethod
-    def get_posts_by_categories(categories):
-        '''Returns all posts which are in the given categories.
+    def get_posts_by_categories(categories, limit=None):
+        '''Returns all posts which are in the given categories, most recent
+        first, or only the latest limit of them.
 
         Note category is a foreign key, so a post only belongs to one category.
         Therefore there is no union or intersection operation as there is
@@ -519,14 +746,22 @@ class BasicPost(models.Model):
                             "string or unicode object."  %
                             unicode(type(categories)))
 
-        return BasicPost.objects.published().\
+        posts = BasicPost.objects.published().\
                     filter(category__name__in=categories).\
-                        select_subclasses().distinct()
+                        order_by('-date_published').\
+                            select_subclasses().distinct()
+        if limit:
+            posts = posts[:limit]
+        return posts
 
     @staticmethod
     def get_posts_by_author(author):
-        '''Returns all posts which is authored or co-authored by the author
-        passed as an argument to this method.
+        '''Returns all published posts on the current site which are authored
+        or co-authored by the author passed as an argument to this method.
+
+        The result is a queryset, most recent first. The OrderedCredit lookup
+        is done as a subquery, which is covered by the unique index on
+        (credit, content_type, object_id).
         '''
         if type(author) == str or type(author) == unicode:
             author = int(author)
@@ -535,28 +770,16 @@ class BasicPost(models.Model):
             raise TypeError("Author is a %s. Expected author to be an int, string"
                             " or unicode object." % unicode(type(author)))
 
-        author = Credit.objects.get(id=author)
-        ordered_credits = OrderedCredit.objects.filter(credit=author)
-        posts = []
-        post_classes = [BasicPost]
-        for subclass in BasicPost.get_subclasses():
-            post_classes.append(subclass.model)
-        for ordered_credit in ordered_credits:
-            if type(ordered_credit.content_object) in post_classes:
-                if ordered_credit.content_object.is_published():
-                    posts.append(ordered_credit.content_object)
-        posts = set(posts)
-        return posts
+        post_ids = OrderedCredit.objects.filter(credit__id=author,
+                    content_type__in=BasicPost.get_post_content_types()).\
+                        values('object_id')
+
+        return BasicPost.objects.published().filter(pk__in=post_ids).\
+                    distinct().order_by('-date_published').select_subclasses()
 
     @staticmethod
-    def get_featured_posts():
-        posts = []
-        post_classes = [BasicPost]
-        for subclass in BasicPost.get_subclasses():
-            post_classes.append(subclass.model)
-        for subclass in post_classes:
-            posts += filter(lambda p: p.featured, subclass.objects.all())
-        return posts
+    def get_featured_posts(limit=None):
+        return BasicPost.objects.featured(limit)
 
     @models.permalink
     def get_absolute_url(self):
@@ -719,3 +942,57 @@ class EditorChoice(models.Model):
 for p in [BasicPost, PostWithImage, PostWithSlideshow, PostWithEmbeddedObject]:
     if p not in moderator._registry:
         moderator.register(p, PostModerator)
+
+
+def invalidate_post_caches(sender, instance, **kwargs):
+    '''Signal handler that makes cached post pages stale when a post, or the
+    sites it is published on, change.
+    '''
+    if isinstance(instance, BasicPost):
+        caching.bump_generation()
+
+def invalidate_comment_caches(sender, instance, **kwargs):
+    '''Signal handler that makes cached post pages stale when a comment on a
+    post changes.
+    '''
+    if instance.content_type_id in \
+            [ct.id for ct in BasicPost.get_post_content_types()]:
+        caching.bump_generation()
+
+def update_tag_counts(sender, instance, **kwargs):
+    '''Signal handler that keeps the cached tag counts up to date, and makes
+    cached post pages stale, as posts are tagged and untagged.
+    '''
+    if instance.content_type_id not in \
+            [ct.id for ct in BasicPost.get_post_content_types()]:
+        return
+    caching.bump_generation()
+    try:
+        name = instance.tag.name
+    except Tag.DoesNotExist:
+        caching.clear_tag_counts()
+        return
+    if kwargs.get('signal') is post_delete:
+        caching.adjust_tag_count(name, -1)
+    elif kwargs.get('created'):
+        caching.adjust_tag_count(name, 1)
+    else: # The item may have moved to another tag
+        caching.clear_tag_counts()
+
+def clear_tag_counts(sender, instance, **kwargs):
+    '''Signal handler that drops the cached tag counts, and makes cached post
+    pages stale, when a tag is renamed or deleted.
+    '''
+    if not kwargs.get('created'):
+        caching.clear_tag_counts()
+        caching.bump_generation()
+
+post_save.connect(invalidate_post_caches)
+post_delete.connect(invalidate_post_caches)
+m2m_changed.connect(invalidate_post_caches, sender=BasicPost.sites.through)
+post_save.connect(invalidate_comment_caches, sender=Comment)
+post_delete.connect(invalidate_comment_caches, sender=Comment)
+post_save.connect(update_tag_counts, sender=TaggedItem)
+post_delete.connect(update_tag_counts, sender=TaggedItem)
+post_save.connect(clear_tag_counts, sender=Tag)
+post_delete.connect(clear_tag_counts, sender=Tag)
@@ -1,10 +1,11 @@
 from post.models import BasicPost
 
-from haystack.indexes import SearchIndex, CharField, DateTimeField
+from haystack.indexes import CharField, DateTimeField
 from haystack import site
+from searchqueue.indexes import QueuedSearchIndex
 
 
-class BasicPostIndex(SearchIndex):
+class BasicPostIndex(QueuedSearchIndex):
     text = CharField(document=True, use_template=True)
     pub_date = DateTimeField(model_attr='date_published')
 
@@ -12,5 +13,8 @@ class BasicPostIndex(SearchIndex):
         """Used when the entire index for model is updated."""
         return BasicPost.objects.published()
 
+    def get_publish_field(self):
+        return 'date_published'
+
 
 site.register(BasicPost, BasicPostIndex)
@@ -2,58 +2,105 @@ import re
 import tagging.utils
 
 from django import template
+from django.core.cache import cache
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.comments.models import Comment
+from django.utils.encoding import smart_str
+from django.utils.hashcompat import md5_constructor
 from tagging.models import Tag
 
-from post.models import BasicPost, EditorChoice, PostWithImage, PostWithSimpleImage, PostWithSlideshow, PostWithEmbeddedObject
+from post.models import BasicPost, EditorChoice
 from feeder.models import Feed
+from post import app_settings
+from post import caching
 
 register = template.Library()
 
 
 class PostsByCategory(template.Node):
-    def __init__(self, categories, var_name):
+    def __init__(self, categories, limit, var_name):
         self.categories = categories
+        self.limit = limit
         self.var_name = var_name
 
     def render(self, context):
         try:
-            context[self.var_name] =  BasicPost.get_posts_by_categories(self.categories)
+            cache_key = caching.make_key('posts_by_categories',
+                    md5_constructor(smart_str(self.categories)).hexdigest(),
+                    self.limit)
+            posts = cache.get(cache_key)
+            if posts is None:
+                posts = list(BasicPost.get_posts_by_categories(self.categories,
+                                                               self.limit))
+                cache.set(cache_key, posts, 60 * app_settings.CACHE_TIME)
+            context[self.var_name] = posts
         except:
             pass
         return ""
 
 def do_get_posts_by_categories(parser, token):
-
+    '''Usage: {% get_posts_by_categories "category[,category...]" [limit] as var_name %}
+    '''
     try:
         # split_contents() knows not to split quoted strings.
         template_tag_name, arg = token.contents.split(None, 1)
     except ValueError:
         raise template.TemplateSyntaxError("%r tag requires arguments" % token.contents.split()[0])
 
-    m = re.search(r'(\"\w+\") as (\w+)', arg)
+    m = re.search(r'(\"[^\"]+\")\s+(?:(\d+)\s+)?as\s+(\w+)', arg)
 
     if not m:
         raise template.TemplateSyntaxError("%r tag had invalid arguments" % template_tag_name)
 
-    tags, var_name = m.groups()
-    return PostsByCategory(tags[1:-1], var_name)
+    categories, limit, var_name = m.groups()
+    if limit:
+        limit = int(limit)
+    return PostsByCategory(categories[1:-1], limit, var_name)
 
 register.tag('get_posts_by_categories', do_get_posts_by_categories)
 
+class FeaturedPosts(template.Node):
+    def __init__(self, limit, var_name):
+        self.limit = limit
+        self.var_name = var_name
+
+    def render(self, context):
+        cache_key = caching.make_key('featured_posts', self.limit)
+        posts = cache.get(cache_key)
+        if posts is None:
+            posts = list(BasicPost.objects.featured(self.limit))
+            cache.set(cache_key, posts, 60 * app_settings.CACHE_TIME)
+        context[self.var_name] = posts
+        return ""
+
+def do_get_featured_posts(parser, token):
+    '''Usage: {% get_featured_posts [limit] as var_name %}
+    '''
+    m = re.search(r'^\w+\s+(?:(\d+)\s+)?as\s+(\w+)$', token.contents)
+
+    if not m:
+        raise template.TemplateSyntaxError("%r tag had invalid arguments" % token.contents.split()[0])
+
+    limit, var_name = m.groups()
+    if limit:
+        limit = int(limit)
+    else:
+        limit = app_settings.FEATURED_POSTS
+    return FeaturedPosts(limit, var_name)
+
+register.tag('get_featured_posts', do_get_featured_posts)
+
 def get_tag_cloud():
-    names = set()
-    cloud = Tag.objects.cloud_for_model(BasicPost, min_count=8)
-    cloud += Tag.objects.cloud_for_model(PostWithImage, min_count=8)
-    cloud += Tag.objects.cloud_for_model(PostWithSimpleImage, min_count=8)
-    cloud += Tag.objects.cloud_for_model(PostWithSlideshow, min_count=8)
-    cloud += Tag.objects.cloud_for_model(PostWithEmbeddedObject, min_count=8)
-    sorted(cloud, key=lambda c: c.name)
-    keys = { }
-    for c in cloud:
-        keys[c.name] = c
-    return {"tags" : keys.values()}
+    '''Tag cloud over posts of all types, built from the cached tag counts.
+    '''
+    tags = []
+    for name, count in BasicPost.get_tag_counts().items():
+        if count >= app_settings.TAG_CLOUD_MIN_COUNT:
+            tag = Tag(name=name)
+            tag.count = count
+            tags.append(tag)
+    tags.sort(key=lambda t: t.name)
+    return {"tags" : tagging.utils.calculate_cloud(tags)}
 
 register.inclusion_tag('tag_cloud.html')(get_tag_cloud)
 
@@ -65,8 +112,7 @@ class PostsByTagsUnion(template.Node):
 
     def render(self, context):
         try:
-            context[self.var_name] =  sorted(BasicPost.get_posts_by_tags_union(self.tags),
-                      key=lambda p: p.date_published, reverse=True)
+            context[self.var_name] =  BasicPost.get_posts_by_tags_union(self.tags)
         except:
             pass
         return ""
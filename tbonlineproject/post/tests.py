@@ -7,6 +7,7 @@ Replace this with more appropriate tests for your application.
 
 import datetime
 
+from django.conf import settings
 from django.utils import unittest
 from django.test.client import Client
 from django.contrib.sites.models import Site
@@ -205,6 +206,149 @@ class PostTest(unittest.TestCase):
         for t in tagging.models.Tag.objects.cloud_for_model(BasicPost):
             print t.font_size
 
+    def testTagsIntersection(self):
+        posts = BasicPost.get_posts_by_tags_intersection("published,even")
+        self.assertEquals([p.id for p in posts], [6])
+        self.assertEquals(type(posts[0]), PostWithImage)
+
+        posts = BasicPost.get_posts_by_tags_intersection(["published", "nosuchtag"])
+        self.assertEquals([p.id for p in posts], [6, 3])
+
+        posts = BasicPost.get_posts_by_tags_intersection("published,unpublished")
+        self.assertEquals(posts.count(), 0)
+
+    def testTagCounts(self):
+        counts = BasicPost.rebuild_tag_counts()
+        self.assertEquals(counts, {'published': 2, 'unpublished': 4,
+                                   'even': 3, 'odd': 3})
+
+        p = BasicPost.objects.filter(pk=3).select_subclasses()[0]
+        item = TaggedItem.objects.create(object=p,
+                                         tag=Tag.objects.get(name='even'))
+        self.assertEquals(BasicPost.get_tag_counts()['even'], 4)
+        item.delete()
+        self.assertEquals(BasicPost.get_tag_counts()['even'], 3)
+
+        Tag.objects.get(name='odd').delete()
+        self.assertFalse('odd' in BasicPost.get_tag_counts())
+
+    def testPostsByCategories(self):
+        from categories.models import Category
+
+        news = Category.objects.create(name="News")
+        for pk in [3, 4, 6]:
+            p = BasicPost.objects.get(pk=pk)
+            p.category = news
+            p.save()
+
+        posts = BasicPost.get_posts_by_categories("News")
+        self.assertEquals([p.id for p in posts], [6, 3])
+        self.assertEquals(type(posts[0]), PostWithImage)
+        posts = BasicPost.get_posts_by_categories("News", 1)
+        self.assertEquals([p.id for p in posts], [6])
+        self.assertEquals(BasicPost.get_posts_by_categories("Sport").count(), 0)
+        news.delete()
+
+    def testFeaturedPosts(self):
+        from django.template import Context, Template
+
+        template = Template('{% load posttags %}'
+                            '{% get_featured_posts as featured %}')
+        # Caches the list before any post is featured
+        template.render(Context())
+
+        for pk in [4, 6]:
+            p = BasicPost.objects.get(pk=pk)
+            p.featured = True
+            p.save()
+
+        posts = BasicPost.objects.featured()
+        self.assertEquals([p.id for p in posts], [6])
+        self.assertEquals(type(posts[0]), PostWithImage)
+
+        # Saving the posts invalidated the cached list
+        context = Context()
+        template.render(context)
+        self.assertEquals([p.id for p in context['featured']], [6])
+
+    def testCacheGeneration(self):
+        from post import caching
+
+        generation = caching.get_generation()
+        p = BasicPost.objects.get(pk=3)
+        p.title = "A new title"
+        p.save()
+        self.assertNotEquals(caching.get_generation(), generation)
+        self.assertNotEquals(caching.make_key('context_frontpage', 1),
+                             caching.make_key('context_frontpage', 2))
+
+    def testFrontPageBadPage(self):
+        c = Client()
+        self.assertEquals(c.get('/?page=a%20b').status_code, 404)
+        self.assertEquals(c.get('/?page=99999').status_code, 404)
+
+    def testAnonymousResponseCache(self):
+        c = Client()
+        response = c.get('/posts/id/3/', follow=True)
+        url = response.redirect_chain[-1][0]
+
+        response = c.get(url)
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = c.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEquals(response.status_code, 304)
+
+    def testAnonymousResponseCacheShared(self):
+        first = Client()
+        url = first.get('/posts/id/3/', follow=True).redirect_chain[-1][0]
+        response = first.get(url)
+        self.assertEquals(response.status_code, 200)
+
+        # Not saved, so the cached page isn't invalidated
+        title = BasicPost.objects.get(pk=3).title
+        BasicPost.objects.filter(pk=3).update(title='A changed title')
+        try:
+            second = Client()
+            response = second.get(url)
+            self.assertEquals(response.status_code, 200)
+            self.assertTrue(title in response.content)
+            self.assertFalse('A changed title' in response.content)
+            if 'csrfmiddlewaretoken' in response.content:
+                self.assertTrue(second.cookies[settings.CSRF_COOKIE_NAME].value
+                                in response.content)
+        finally:
+            BasicPost.objects.filter(pk=3).update(title=title)
+
+    def testConditionalGet(self):
+        c = Client()
+        detail_url = c.get('/posts/id/3/', follow=True).redirect_chain[-1][0]
+        urls = ['/posts/', '/posts/feed/', '/stories/', '/sitemap.xml',
+                '/posts/tag/even/', detail_url]
+        validators = {}
+        for url in urls:
+            response = c.get(url)
+            self.assertEquals(response.status_code, 200)
+            self.assertTrue(response.has_header('Last-Modified'))
+            self.assertTrue(response.has_header('ETag'))
+            validators[url] = {
+                'HTTP_IF_MODIFIED_SINCE': response['Last-Modified'],
+                'HTTP_IF_NONE_MATCH': response['ETag']}
+            response = c.get(url,
+                        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEquals(response.status_code, 304)
+            response = c.get(url, **validators[url])
+            self.assertEquals(response.status_code, 304)
+
+        # Deleting a post leaves the latest modification date of the
+        # remaining posts unchanged, but the clients' copies of the lists
+        # are stale
+        BasicPost.objects.published().exclude(pk=3)[0].delete()
+        for url in urls[:-1]:
+            response = c.get(url, **validators[url])
+            self.assertEquals(response.status_code, 200)
+
     def testCredits(self):
         jane = Credit.objects.create(first_names='Jane', last_name='Bloggs')
         joe = Credit.objects.create(first_names='Joe', last_name='Smith')
@@ -250,6 +394,32 @@ class PostTest(unittest.TestCase):
         authors = BasicPost.objects.select_subclasses().filter(pk=3)[0].get_authors()
         self.assertEquals(authors, "Jane Bloggs and Wikipedia")
 
+        posts = BasicPost.get_posts_by_author(unicode(jane.id))
+        self.assertEquals([p.id for p in posts], [3])
+        posts = BasicPost.get_posts_by_author(tom.id)
+        self.assertEquals(posts.count(), 0)
+
+    def testPrefetchMeta(self):
+        jane = Credit.objects.create(first_names='Jane', last_name='Bloggs')
+        p = BasicPost.objects.filter(pk=6).select_subclasses()[0]
+        OrderedCredit.objects.create(content_object=p, credit=jane, position=0)
+
+        posts = BasicPost.prefetch_meta(
+                    BasicPost.objects.published().select_subclasses())
+        self.assertEquals([post.pk for post in posts], [6, 3])
+        self.assertEquals([unicode(a) for a in posts[0].get_author_list()],
+                          [u'Jane Bloggs'])
+        self.assertEquals(posts[1].get_author_list(), [])
+        self.assertEquals(sorted([t.name for t in posts[0].get_tag_list()]),
+                          [u'even', u'published'])
+        self.assertEquals(sorted([t.name for t in posts[1].get_tag_list()]),
+                          [u'odd', u'published'])
+        self.assertEquals(posts[0].get_comment_count(), 0)
+
+        fresh = BasicPost.objects.filter(pk=6).select_subclasses()[0]
+        self.assertEquals(fresh.get_author_list(), posts[0].get_author_list())
+        self.assertEquals(fresh.get_comment_count(), 0)
+
     def testUniqueSlug(self):
         BasicPost.objects.create(title="Test slug 1", slug="t")
         BasicPost.objects.create(title="Test slug 2", slug="t")
@@ -263,6 +433,12 @@ class PostTest(unittest.TestCase):
         posts = BasicPost.objects.filter(slug="t-2")
         self.assertEquals(len(posts), 1)
         self.assertEquals(posts[0].title, "Test slug 3")
+        # Slugs that merely start with the same letters don't count
+        self.assertEquals(BasicPost.objects.create(title="Test slug 4",
+                                                   slug="t-shirts").slug,
+                          "t-shirts")
+        self.assertEquals(BasicPost.objects.create(title="Test slug 5",
+                                                   slug="t").slug, "t-3")
 
     def testEnhancedTextField(self):
         p = BasicPost.objects.select_subclasses()[0]
@@ -416,7 +592,45 @@ This is the third paragraph.\M"""
         self.assertEquals(p.get_introduction(), """\n\n<p>This is the second paragraph. </p>\n""")
         self.assertEquals(p.get_body(), """\n\n<p>This is the third paragraph.</p>""")
 
+    def testRenderedFields(self):
+        p = BasicPost.objects.select_subclasses()[0]
+        p.teaser = ""
+        p.introduction = ""
+        p.body = """<p>The first paragraph.</p><!--endteaser--><p>The second paragraph.</p>"""
+        p.save()
+
+        p = BasicPost.objects.get(pk=p.pk)
+        self.assertEquals(p.rendered_teaser, "<p>The first paragraph.</p>")
+        self.assertEquals(p.rendered_introduction, "<p>The first paragraph.</p>")
+        self.assertEquals(p.rendered_body, "<p>The second paragraph.</p>")
 
+        # Changing a field must invalidate the remembered split
+        p.teaser = "<p>A new teaser</p>"
+        self.assertEquals(p.get_teaser(), "<p>A new teaser</p>")
+
+    def testPostType(self):
+        p = BasicPost.objects.get(pk=6)
+        self.assertEquals(type(p), BasicPost)
+        self.assertEquals(p.get_class(), PostWithImage)
+        self.assertEquals(type(p.as_subclass()), PostWithImage)
+
+        p = BasicPost.objects.get(pk=3)
+        self.assertEquals(p.get_class(), BasicPost)
+        self.assertEquals(p.as_subclass(), p)
+
+    def testSelectSubclassesByPostType(self):
+        posts = BasicPost.objects.select_subclasses()
+        # No subclass tables are joined
+        self.assertFalse('postwithimage' in str(posts.query))
+        types = dict((p.pk, type(p)) for p in posts)
+        self.assertEquals(types[6], PostWithImage)
+        self.assertEquals(types[3], BasicPost)
+
+        # Posts saved before post_type existed are still resolved
+        BasicPost.objects.filter(pk=6).update(post_type=None)
+        self.assertEquals(type(BasicPost.objects.filter(pk=6).select_subclasses()[0]),
+                          PostWithImage)
+        BasicPost.objects.get(pk=6).save()
 
     def testSites(self):
 
@@ -1,10 +1,12 @@
 from django.conf.urls.defaults import *
 from django.contrib.auth.decorators import permission_required
+from django.views.decorators.http import condition
 from django.views.generic import TemplateView
 
 from post.views import ListPostView, DateDetailPostView, \
     PostsByTagView, DraftPostView, RedirectPostView, PostsByCategoryView, \
-    PostsByAuthorView, SubmittedArticleListView
+    PostsByAuthorView, SubmittedArticleListView, latest_post_modified, \
+    latest_post_etag
 from post.feeds import LatestEntriesFeed
 
 urlpatterns = patterns('post.views',
@@ -27,7 +29,9 @@ urlpatterns = patterns('post.views',
         (DraftPostView.as_view()), name='post_draft_detail'),
 
     # RSS feed for posts 
-    url(r'^feed/$', LatestEntriesFeed(), name='post_feed'),
+    url(r'^feed/$', condition(etag_func=latest_post_etag,
+                              last_modified_func=latest_post_modified)
+        (LatestEntriesFeed()), name='post_feed'),
     
     # List view by tag
     url(r'^tag/(?P<tag>[\"\w\" \-]+)/$', PostsByTagView.as_view(), name='post_tag_list'),
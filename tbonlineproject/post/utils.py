@@ -0,0 +1,73 @@
+'''Utility functions for post app. These are also used by the gallery and story
+apps, so this module must not import any models.
+'''
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+def get_unique_slug(obj, slug=None, queryset=None):
+    """Returns slug, or obj.slug if slug is not given, made unique by adding
+    -1, -2 etc. if it is already used.
+
+    The slug itself and the slugs that extend it with a hyphen are fetched in
+    one query, and the first free numeric suffix is calculated from them,
+    instead of querying once per candidate.
+
+    Arguments:
+    obj -- Model instance with a slug field
+    slug -- The slug to make unique
+    queryset -- Objects whose slugs must not be reused. Defaults to all
+    objects of obj's model.
+    """
+    if slug is None:
+        slug = obj.slug
+
+    if queryset is None:
+        queryset = obj.__class__._default_manager.all()
+    if obj.pk:
+        queryset = queryset.exclude(pk=obj.pk)
+
+    prefix = slug + '-'
+    taken = list(queryset.filter(Q(slug=slug) | Q(slug__startswith=prefix)).\
+                    values_list('slug', flat=True))
+    if slug not in taken:
+        return slug
+
+    # Only -N suffixes matter, e.g. "t-2" but not "t-shirts"
+    used = set()
+    for s in taken:
+        suffix = s[len(prefix):]
+        if suffix.isdigit():
+            used.add(int(suffix))
+
+    counter = 1
+    while counter in used:
+        counter += 1
+    return prefix + unicode(counter)
+
+def save_with_unique_slug(obj, save, queryset=None, attempts=3):
+    """Makes obj.slug unique and calls save().
+
+    If another process takes the same slug between the check and the save,
+    the database raises an IntegrityError. The save is then rolled back to a
+    savepoint and retried with a freshly calculated slug.
+
+    Arguments:
+    obj -- Model instance with a slug field
+    save -- Callable that saves obj, usually the superclass save method
+    queryset -- As for get_unique_slug
+    attempts -- Number of times to try before letting the IntegrityError out
+    """
+    slug = obj.slug
+    for attempt in range(attempts):
+        obj.slug = get_unique_slug(obj, slug, queryset)
+        sid = transaction.savepoint()
+        try:
+            save()
+        except IntegrityError:
+            transaction.savepoint_rollback(sid)
+            if attempt == attempts - 1:
+                raise
+        else:
+            transaction.savepoint_commit(sid)
+            return
@@ -2,12 +2,15 @@
 
 import datetime
 import os
+import sys
 
 from django.contrib.auth.decorators import user_passes_test
+from django.contrib.comments.models import Comment
 from django.contrib.markup.templatetags.markup import markdown
 from django.contrib import messages
 from django.core.cache import cache 
 from django.core.urlresolvers import reverse
+from django.db.models import Max
 from django.forms.formsets import formset_factory
 from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import render_to_response
@@ -15,9 +18,11 @@ from django.shortcuts import get_object_or_404
 from django.template import RequestContext
 from django.template.defaultfilters import slugify
 from django.utils.decorators import method_decorator
+from django.utils.hashcompat import md5_constructor
 from django.utils.translation import ugettext_lazy as _
 from django.views.decorators.cache import cache_page, never_cache
 from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.http import condition
 from django.views.generic import ListView, DateDetailView, DetailView, RedirectView
 
 import settings
@@ -29,35 +34,135 @@ from credit.models import Credit, OrderedCredit
 from enhancedtext.fields import EnhancedText
 from gallery.models import Gallery, Image, OrderedImage
 from post.forms import ArticleSubmissionForm, ImageForm
-from post.models import BasicPost, PostWithSimpleImage, PostWithSlideshow, \
-                            PostModerator, SubmittedArticle
+from post.models import BasicPost, PostWithImage, PostWithSimpleImage, \
+                            PostWithSlideshow, PostModerator, SubmittedArticle
 
 from post import app_settings
+from post import caching
 
 
-class ListPostView(ListView):
+def latest_modified(queryset, *fields):
+    '''Returns the latest value of the date fields over queryset, or None,
+    using one aggregate query.
+    '''
+    if not fields:
+        fields = ('last_modified',)
+    dates = [d for d in queryset.aggregate(*[Max(f) for f in fields]).values()
+             if d]
+    if dates:
+        return max(dates)
+    return None
+
+def generation_modified(last_modified):
+    '''Returns the later of last_modified and the time the post caching
+    generation last changed.
+
+    Deleting or unpublishing a post, or changing its comments or tags, doesn't
+    advance the latest modification date of the posts shown, but it does bump
+    the generation.
+    '''
+    dates = [d for d in (last_modified, caching.get_generation_time()) if d]
+    if dates:
+        return max(dates)
+    return None
+
+def generation_etag(last_modified):
+    '''Returns an ETag that changes with the post caching generation as well
+    as with last_modified.
+    '''
+    return md5_constructor('%s:%s' % (caching.get_generation(),
+                                      last_modified)).hexdigest()
+
+def latest_post_modified(request, *args, **kwargs):
+    '''Last modified function for the condition decorator on views showing
+    the latest published posts, e.g. the RSS feed.
+    '''
+    return generation_modified(latest_modified(BasicPost.objects.published(),
+                                               'last_modified',
+                                               'date_published'))
+
+def latest_post_etag(request, *args, **kwargs):
+    '''ETag function to go with latest_post_modified.'''
+    return generation_etag(latest_post_modified(request))
+
+class ConditionalViewMixin(object):
+    '''Answers conditional GET requests with 304 Not Modified, without
+    rendering the page, if nothing has changed since the client's copy.
+
+    By default the Last-Modified date is the latest of last_modified_fields
+    over the view's queryset. Detail views override get_last_modified(). The
+    post caching generation is folded into both Last-Modified and the ETag,
+    so removing posts or changing comments or tags also invalidates them.
+    '''
+    last_modified_fields = ('last_modified',)
+
+    def get_last_modified(self):
+        return latest_modified(self.get_queryset(), *self.last_modified_fields)
+
+    def dispatch(self, request, *args, **kwargs):
+        # View.dispatch sets these, but get_last_modified() runs first
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        view = super(ConditionalViewMixin, self).dispatch
+        last_modified = []
+        def last_modified_func(request, *args, **kwargs):
+            # The decorator asks twice, once for each validator
+            if not last_modified:
+                last_modified.append(
+                    generation_modified(self.get_last_modified()))
+            return last_modified[0]
+        def etag_func(request, *args, **kwargs):
+            return generation_etag(last_modified_func(request))
+        return condition(etag_func=etag_func,
+                         last_modified_func=last_modified_func)(view)(
+                            request, *args, **kwargs)
+
+class ConditionalDetailViewMixin(ConditionalViewMixin):
+    '''Remembers the object so that get_last_modified() and the view share
+    one query.
+    '''
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super(ConditionalDetailViewMixin, self).get_object(queryset)
+        if getattr(self, '_object', None) is None:
+            self._object = super(ConditionalDetailViewMixin, self).get_object()
+        return self._object
+
+    def get_last_modified(self):
+        return self.get_object().last_modified
+
+
+class ListPostView(ConditionalViewMixin, ListView):
     context_object_name='posts'
     paginate_by=app_settings.POSTS_PER_PAGE
     template_name='post/post_list.html'
+    last_modified_fields = ('last_modified', 'date_published')
     
     def get_queryset(self):
         return BasicPost.objects.published().\
                 select_subclasses()
     
+    def get_context_data(self, **kwargs):
+        '''Loads the authors, tags and comment counts for the whole page in
+        one go, so that the templates don't query them post by post.
+        '''
+        context = super(ListPostView, self).get_context_data(**kwargs)
+        context['posts'] = context['object_list'] = \
+                BasicPost.prefetch_meta(context['object_list'])
+        return context
 
 class PostsByTagView(ListPostView):
     
     def get_queryset(self):
-        return sorted(BasicPost.get_posts_by_tags_union(self.kwargs['tag']), 
-                      key=lambda p: p.date_published, reverse=True)
+        return BasicPost.get_posts_by_tags_union(self.kwargs['tag'])
 
 class PostsByCategoryView(ListPostView):
     
     template_name = 'post/post_category_list.html'
     
     def get_queryset(self):
-        return sorted(BasicPost.get_posts_by_categories(self.kwargs['category']), 
-                      key=lambda p: p.date_published, reverse=True)
+        return BasicPost.get_posts_by_categories(self.kwargs['category'])
 
     def get_context_data(self, **kwargs):
         context = super(PostsByCategoryView, self).get_context_data(**kwargs)
@@ -69,8 +174,7 @@ class PostsByAuthorView(ListPostView):
     template_name = 'post/post_author_list.html'
     
     def get_queryset(self):
-        return sorted(BasicPost.get_posts_by_author(self.kwargs['author']),
-                      key=lambda p: p.date_published, reverse=True)
+        return BasicPost.get_posts_by_author(self.kwargs['author'])
                       
     def get_context_data(self, **kwargs):
         context = super(PostsByAuthorView, self).get_context_data(**kwargs)
@@ -93,6 +197,7 @@ class SubmittedArticleListView(ListView):
         
 class PublishedFrontPagePostsView(ListPostView):
 
+    @method_decorator(caching.cache_anonymous_response('frontpage'))
     def dispatch(self, *args, **kwargs):
         return super(PublishedFrontPagePostsView, self).dispatch(*args, **kwargs)
        
@@ -108,12 +213,19 @@ class PublishedFrontPagePostsView(ListPostView):
                 select_subclasses()
                 
     def get_context_data(self, **kwargs):
-        cache_value = cache.get('context_frontpage', '')
-        if cache_value == '':
+        try:
+            page = int(self.kwargs.get('page') or self.request.GET.get('page') or 1)
+        except ValueError:
+            page = 0
+        if not 0 < page <= sys.maxint:
+            # Leave 'last' and invalid pages to pagination, uncached, so
+            # that odd query strings can't make bad or endless cache keys
+            return super(PublishedFrontPagePostsView, self).get_context_data(**kwargs)
+        cache_key = caching.make_key('context_frontpage', page)
+        context = cache.get(cache_key)
+        if context is None:
             context = super(PublishedFrontPagePostsView, self).get_context_data(**kwargs)
-            cache.add('context_frontpage', context, 60 * settings.CACHE_TIME)
-        else:
-            context = cache.get('context_frontpage')
+            cache.set(cache_key, context, 60 * settings.CACHE_TIME)
         return context
 
 class DetailPostViewMixin(object):
@@ -177,10 +289,23 @@ class RedirectPostView(RedirectView):
             context = cache.get('context')
         return context
 
-class DateDetailPostView(DetailPostViewMixin, DateDetailView):
+class DateDetailPostView(ConditionalDetailViewMixin, DetailPostViewMixin,
+                         DateDetailView):
     date_field = "date_published"
     month_format = "%m"
 
+    def get_last_modified(self):
+        '''The post's page changes when the post or its comments do.
+        '''
+        post = self.get_object()
+        comments = Comment.objects.filter(
+                        content_type__in=BasicPost.get_post_content_types(),
+                        object_pk=unicode(post.pk))
+        return max([d for d in [post.last_modified,
+                                latest_modified(comments, 'submit_date')]
+                    if d])
+
+    @method_decorator(caching.cache_anonymous_response('post_detail'))
     def dispatch(self, *args, **kwargs):
         return super(DateDetailPostView, self).dispatch(*args, **kwargs)
        
@@ -192,14 +317,12 @@ class DateDetailPostView(DetailPostViewMixin, DateDetailView):
         
     def get_context_data(self, **kwargs):
         post =  kwargs['object']
-        cache_key = 'context_%s_%s' % (post.get_class_name(), post.id)
-        cache_value = cache.get(cache_key, '')
+        cache_key = caching.make_key('context', post.get_class_name(), post.id)
+        context = cache.get(cache_key)
 
-        if cache_value == '':
+        if context is None:
             context = super(DateDetailPostView, self).get_context_data(**kwargs)
-            cache.add(cache_key, context, 60 * settings.CACHE_TIME)
-        else:
-            context = cache.get(cache_key)
+            cache.set(cache_key, context, 60 * settings.CACHE_TIME)
         return context
         
 def markdownpreview(request):
@@ -304,16 +427,10 @@ def clear_cache(request):
 
 
 def print_post(request, slug):
-    post = get_object_or_404(BasicPost, slug=slug)
-
-    has_image = False
-    if post.get_class_name() == 'PostWithImage':
-        post = post.postwithimage
-        has_image = True
-    elif post.get_class_name() == 'PostWithSimpleImage':
-        post = post.postwithsimpleimage
-        has_image = True
-        
+    post = get_object_or_404(BasicPost, slug=slug).as_subclass()
+
+    has_image = isinstance(post, (PostWithImage, PostWithSimpleImage))
+
     context = {'post':post,
                'has_image':has_image,}
     return render_to_response('post/post_print.html',
@@ -0,0 +1,10 @@
+from django.conf import settings
+
+# Queued changes read and indexed at a time by processsearchqueue
+BATCH_SIZE = getattr(settings, 'SEARCHQUEUE_BATCH_SIZE', 100)
+
+# Seconds processsearchqueue --poll waits between checks of an empty queue
+POLL_INTERVAL = getattr(settings, 'SEARCHQUEUE_POLL_INTERVAL', 5)
+
+# Objects each worker prepares and indexes at a time during rebuildsearchindex
+REINDEX_CHUNK_SIZE = getattr(settings, 'SEARCHQUEUE_REINDEX_CHUNK_SIZE', 500)
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from django.db.models import signals
+
+from haystack.indexes import SearchIndex
+
+from searchqueue.models import QueuedUpdate, enqueue
+
+
+class QueuedSearchIndex(SearchIndex):
+    '''A SearchIndex that records saves and deletes of its model, and of
+    the model's subclasses, in the QueuedUpdate table. The
+    processsearchqueue command indexes them, so the index stays fresh
+    without full update_index runs and without indexing during requests.
+
+    If get_publish_field() names a date field, an object saved with a
+    future date is queued again for that date, so that it is indexed once
+    it enters index_queryset().
+    '''
+    def _setup_save(self, model):
+        signals.post_save.connect(self.enqueue_update)
+
+    def _setup_delete(self, model):
+        signals.post_delete.connect(self.enqueue_delete)
+
+    def _teardown_save(self, model):
+        signals.post_save.disconnect(self.enqueue_update)
+
+    def _teardown_delete(self, model):
+        signals.post_delete.disconnect(self.enqueue_delete)
+
+    def get_publish_field(self):
+        '''Returns the name of the model's date field before which objects
+        are left out of index_queryset(), or None.
+        '''
+        return None
+
+    def enqueue_update(self, sender, instance, **kwargs):
+        if issubclass(sender, self.model) and \
+                self.should_update(instance, **kwargs):
+            enqueue(self.model, instance.pk, QueuedUpdate.UPDATE)
+            field = self.get_publish_field()
+            publish = field and getattr(instance, field)
+            if publish and publish > datetime.now():
+                enqueue(self.model, instance.pk, QueuedUpdate.UPDATE, publish)
+
+    def enqueue_delete(self, sender, instance, **kwargs):
+        if issubclass(sender, self.model):
+            enqueue(self.model, instance.pk, QueuedUpdate.DELETE)
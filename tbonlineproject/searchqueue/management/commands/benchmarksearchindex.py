@@ -0,0 +1,78 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from haystack import site
+
+from post.models import BasicPost
+
+WORDS = ('tuberculosis', 'treatment', 'patients', 'clinic', 'drug', 'resistant',
+         'diagnosis', 'trial', 'health', 'community', 'research', 'funding',
+         'government', 'testing', 'children', 'hospital', 'medicine', 'cases',
+         'the', 'and', 'of', 'in', 'for', 'with', 'new', 'after', 'more')
+
+def make_text(words):
+    return u' '.join(random.choice(WORDS) for i in range(words))
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(directory, name))
+               for directory, dirs, files in os.walk(path) for name in files)
+
+class Command(BaseCommand):
+    help = 'Measures how many documents per second the search backend ' \
+           'indexes, and the size of the index, for each commit size given, ' \
+           'using a synthetic corpus of posts. The posts are never saved, ' \
+           'and they are indexed into a temporary directory, so the site ' \
+           'and its index are untouched.'
+    option_list = BaseCommand.option_list + (
+        make_option('--posts', dest='posts', type='int', default=1000,
+            help='Number of synthetic posts to index'),
+        make_option('--words', dest='words', type='int', default=500,
+            help='Number of words in the body of each post'),
+        make_option('--commit-sizes', dest='commit_sizes', default='1,100,1000',
+            help='Comma separated numbers of documents written between commits'),
+    )
+
+    def handle(self, *args, **options):
+        if settings.HAYSTACK_SEARCH_ENGINE != 'xapian':
+            raise CommandError('benchmarksearchindex only supports the xapian '
+                               'search engine')
+
+        try:
+            commit_sizes = [int(size) for size in
+                            options.get('commit_sizes').split(',')]
+        except ValueError:
+            raise CommandError('--commit-sizes must be a list of numbers')
+
+        # Sequential pks are enough for the index; nothing is saved
+        posts = []
+        for pk in range(1, options.get('posts') + 1):
+            post = BasicPost(pk=pk, title=make_text(8), slug='post-%d' % pk,
+                             date_published=datetime.now())
+            post.rendered_introduction = make_text(50)
+            post.rendered_body = make_text(options.get('words'))
+            posts.append(post)
+
+        index = site.get_index(BasicPost)
+        path = settings.HAYSTACK_XAPIAN_PATH
+        for commit_size in commit_sizes:
+            settings.HAYSTACK_XAPIAN_PATH = tempfile.mkdtemp()
+            try:
+                start = time.time()
+                index.backend.update(index, posts, commit_size=commit_size)
+                seconds = time.time() - start
+                size = directory_size(settings.HAYSTACK_XAPIAN_PATH)
+            finally:
+                shutil.rmtree(settings.HAYSTACK_XAPIAN_PATH)
+                settings.HAYSTACK_XAPIAN_PATH = path
+            self.stdout.write('Commit size %d: %d documents in %.2f seconds, '
+                              '%.1f documents per second, index %d KB\n' %
+                              (commit_size, len(posts), seconds,
+                               len(posts) / max(seconds, 0.001), size / 1024))
@@ -0,0 +1,47 @@
+import sys
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from searchqueue import app_settings
+from searchqueue.utils import process_queue, queue_status
+
+class Command(BaseCommand):
+    help = 'Indexes the changes to searchable objects queued since the ' \
+           'last run. Run it on a schedule, or keep it running with --poll.'
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', dest='batch_size', type='int',
+            default=app_settings.BATCH_SIZE,
+            help='Number of queued changes indexed at a time'),
+        make_option('--poll', dest='poll', action='store_true', default=False,
+            help='Keep checking the queue instead of exiting once it is empty'),
+    )
+
+    def process(self, batch_size):
+        depth, lag = queue_status()
+        if not depth:
+            return 0
+        self.stdout.write('Queue depth %d, oldest change %d seconds ago\n' %
+                          (depth, lag))
+        start = time.time()
+        try:
+            processed = process_queue(batch_size)
+        except:
+            self.stdout.write('Error indexing queued changes: %s %s\n' %
+                              (sys.exc_info()[0], sys.exc_info()[1]))
+            return 0
+        self.stdout.write('Indexed %d queued changes in %.2f seconds\n' %
+                          (processed, time.time() - start))
+        return processed
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size') or app_settings.BATCH_SIZE
+
+        if not options.get('poll'):
+            self.process(batch_size)
+            return
+
+        while True:
+            if not self.process(batch_size):
+                time.sleep(app_settings.POLL_INTERVAL)
@@ -0,0 +1,32 @@
+import time
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from searchqueue import app_settings
+from searchqueue.utils import rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuilds the whole Xapian search index, preparing and indexing ' \
+           'objects in parallel, and swaps it in for the live index once ' \
+           'it is complete. Stop processsearchqueue while it runs, and ' \
+           'start it again afterwards, so that changes saved during the ' \
+           'rebuild are applied to the new index.'
+    option_list = BaseCommand.option_list + (
+        make_option('--workers', dest='workers', type='int', default=None,
+            help='Number of processes indexing in parallel (default: one per CPU)'),
+        make_option('--chunk-size', dest='chunk_size', type='int',
+            default=app_settings.REINDEX_CHUNK_SIZE,
+            help='Number of objects a process indexes at a time'),
+    )
+
+    def handle(self, *args, **options):
+        if settings.HAYSTACK_SEARCH_ENGINE != 'xapian':
+            raise CommandError('rebuildsearchindex only supports the xapian '
+                               'search engine')
+
+        start = time.time()
+        indexed = rebuild_index(options.get('workers'), options.get('chunk_size'))
+        self.stdout.write('Indexed %d objects in %.2f seconds\n' %
+                          (indexed, time.time() - start))
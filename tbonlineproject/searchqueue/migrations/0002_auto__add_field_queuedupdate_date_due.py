@@ -0,0 +1,46 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding field 'QueuedUpdate.date_due'
+        db.add_column('searchqueue_queuedupdate', 'date_due', self.gf('django.db.models.fields.DateTimeField')(default=datetime.datetime.now, db_index=True), keep_default=False)
+
+        # Adding index on 'QueuedUpdate', fields ['date_due']
+        db.create_index('searchqueue_queuedupdate', ['date_due'])
+
+
+    def backwards(self, orm):
+        
+        # Removing index on 'QueuedUpdate', fields ['date_due']
+        db.delete_index('searchqueue_queuedupdate', ['date_due'])
+
+        # Deleting field 'QueuedUpdate.date_due'
+        db.delete_column('searchqueue_queuedupdate', 'date_due')
+
+
+    models = {
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'searchqueue.queuedupdate': {
+            'Meta': {'ordering': "('id',)", 'object_name': 'QueuedUpdate'},
+            'action': ('django.db.models.fields.CharField', [], {'max_length': '1'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'date_added': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'date_due': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'db_index': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object_id': ('django.db.models.fields.PositiveIntegerField', [], {})
+        }
+    }
+
+    complete_apps = ['searchqueue']
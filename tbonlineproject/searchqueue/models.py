@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django.contrib.contenttypes.models import ContentType
+
+
+class QueuedUpdate(models.Model):
+    '''A change to an indexed object that hasn't reached the search index
+    yet. Rows are added by QueuedSearchIndex's signal handlers and removed
+    by the processsearchqueue command once indexed.
+    '''
+    UPDATE = 'U'
+    DELETE = 'D'
+    ACTION_CHOICES = (
+        (UPDATE, _('Update')),
+        (DELETE, _('Delete')),
+    )
+
+    content_type = models.ForeignKey(ContentType)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=1, choices=ACTION_CHOICES)
+    date_added = models.DateTimeField(default=datetime.now, editable=False)
+    # Not processed before this time, e.g. a post's publication date
+    date_due = models.DateTimeField(default=datetime.now, db_index=True,
+                                    editable=False)
+
+    def __unicode__(self):
+        return u'%s %s.%d' % (self.get_action_display(), self.content_type,
+                              self.object_id)
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = _('queued search update')
+        verbose_name_plural = _('queued search updates')
+
+
+def enqueue(model, pk, action, due=None):
+    QueuedUpdate.objects.create(
+        content_type=ContentType.objects.get_for_model(model),
+        object_id=pk, action=action, date_due=due or datetime.now())
@@ -0,0 +1,114 @@
+import datetime
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.test import TestCase, TransactionTestCase
+from django.utils import unittest
+
+from haystack import site
+
+from post.models import BasicPost
+from searchqueue.models import QueuedUpdate
+from searchqueue.utils import process_queue, queue_status, rebuild_index
+
+try:
+    import xapian
+except ImportError:
+    xapian = None
+
+
+class RecordingBackend(object):
+    '''Stands in for the search backend and records what it is asked to do.
+    '''
+    def __init__(self):
+        self.updated = []
+        self.removed = []
+
+    def update(self, index, iterable):
+        self.updated.extend(obj.pk for obj in iterable)
+
+    def remove(self, obj_or_string):
+        self.removed.append(obj_or_string)
+
+
+class QueueTest(TestCase):
+
+    def setUp(self):
+        self.index = site.get_index(BasicPost)
+        self.backend = self.index.backend
+        self.index.backend = RecordingBackend()
+
+    def tearDown(self):
+        self.index.backend = self.backend
+
+    def testQueue(self):
+        self.assertEqual(queue_status(), (0, 0))
+
+        published = BasicPost.objects.create(title='Published',
+                        slug='published',
+                        date_published=datetime.datetime.now())
+        published.sites.add(Site.objects.get_current())
+        published.save()
+        unpublished = BasicPost.objects.create(title='Unpublished',
+                                               slug='unpublished')
+        self.assertEqual(queue_status()[0], 3)
+
+        self.assertEqual(process_queue(batch_size=2), 3)
+        self.assertEqual(queue_status(), (0, 0))
+        self.assertEqual(self.index.backend.updated, [published.pk])
+        self.assertEqual(self.index.backend.removed,
+                         [u'post.basicpost.%d' % unpublished.pk])
+
+        pk = published.pk
+        published.delete()
+        self.assertEqual(QueuedUpdate.objects.get().action, QueuedUpdate.DELETE)
+        self.assertEqual(process_queue(), 1)
+        self.assertEqual(self.index.backend.removed[-1], u'post.basicpost.%d' % pk)
+
+    def testScheduledPost(self):
+        now = datetime.datetime.now()
+        post = BasicPost.objects.create(title='Scheduled', slug='scheduled',
+                        date_published=now + datetime.timedelta(hours=1))
+        post.sites.add(Site.objects.get_current())
+        # The update for the publication date isn't due yet
+        self.assertEqual(queue_status()[0], 1)
+        self.assertEqual(process_queue(), 1)
+        self.assertEqual(self.index.backend.updated, [])
+        self.assertEqual(QueuedUpdate.objects.count(), 1)
+
+        # Let the publication date pass
+        BasicPost.objects.filter(pk=post.pk).update(date_published=now)
+        QueuedUpdate.objects.update(date_due=now)
+        self.assertEqual(process_queue(), 1)
+        self.assertEqual(self.index.backend.updated, [post.pk])
+        self.assertEqual(QueuedUpdate.objects.count(), 0)
+
+
+@unittest.skipIf(xapian is None, 'xapian is not installed')
+class RebuildIndexTest(TransactionTestCase):
+
+    def setUp(self):
+        self.path = settings.HAYSTACK_XAPIAN_PATH
+        self.directory = tempfile.mkdtemp()
+        settings.HAYSTACK_XAPIAN_PATH = os.path.join(self.directory, 'index')
+        for i in range(3):
+            post = BasicPost.objects.create(title='Post %d' % i,
+                        slug='rebuild-%d' % i,
+                        date_published=datetime.datetime.now())
+            post.sites.add(Site.objects.get_current())
+
+    def tearDown(self):
+        settings.HAYSTACK_XAPIAN_PATH = self.path
+        shutil.rmtree(self.directory)
+
+    def testRebuild(self):
+        path = settings.HAYSTACK_XAPIAN_PATH
+        for i in range(2):
+            self.assertEqual(rebuild_index(workers=2, chunk_size=1), 3)
+            self.assertTrue(os.path.islink(path))
+            self.assertEqual(xapian.Database(path).get_doccount(), 3)
+        # Only the live index and its link are left
+        self.assertEqual(len(os.listdir(self.directory)), 2)
@@ -0,0 +1,204 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from multiprocessing import Pool, cpu_count
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import get_model
+
+from haystack import site
+from haystack.exceptions import NotRegistered
+
+from searchqueue import app_settings
+from searchqueue.models import QueuedUpdate
+
+
+def queue_status():
+    '''Returns (depth, lag): the number of queued changes that are due and
+    the seconds since the longest waiting of them fell due, which is 0 if
+    none are. Changes scheduled for later aren't counted.
+    '''
+    now = datetime.now()
+    due = QueuedUpdate.objects.filter(date_due__lte=now)
+    depth = due.count()
+    lag = 0
+    if depth:
+        oldest = due.order_by('date_due')[0].date_due
+        delta = now - oldest
+        lag = delta.days * 86400 + delta.seconds
+    return depth, lag
+
+def index_objects(index, updates, deletes):
+    '''Indexes the objects of index's model with pks in updates, and
+    removes those with pks in deletes. Updated objects that are no longer
+    in the index's queryset, such as unpublished posts, are removed too.
+    '''
+    objects = []
+    if updates:
+        objects = list(index.index_queryset().filter(pk__in=updates))
+    if objects:
+        index.backend.update(index, objects)
+
+    indexed = set(obj.pk for obj in objects)
+    meta = index.model._meta
+    for pk in deletes + [pk for pk in updates if pk not in indexed]:
+        index.backend.remove(u'%s.%s.%s' % (meta.app_label, meta.module_name, pk))
+
+def process_queue(batch_size=None):
+    '''Indexes queued changes that are due, batch_size at a time, until
+    none are left and returns the number of queued rows processed.
+
+    Several changes to the same object within a batch are collapsed into
+    the last one. Rows are only deleted once their batch is indexed, so
+    an error leaves them queued for the next run.
+    '''
+    batch_size = batch_size or app_settings.BATCH_SIZE
+    processed = 0
+
+    while True:
+        batch = list(QueuedUpdate.objects.filter(date_due__lte=datetime.now()).
+                     order_by('id')[:batch_size])
+        if not batch:
+            break
+
+        actions = {}
+        for item in batch:
+            actions[(item.content_type_id, item.object_id)] = item.action
+
+        changes = {}
+        for (content_type_id, object_id), action in actions.items():
+            updates, deletes = changes.setdefault(content_type_id, ([], []))
+            if action == QueuedUpdate.DELETE:
+                deletes.append(object_id)
+            else:
+                updates.append(object_id)
+
+        for content_type_id, (updates, deletes) in changes.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            try:
+                index = site.get_index(model)
+            except NotRegistered:
+                continue
+            index_objects(index, updates, deletes)
+
+        QueuedUpdate.objects.filter(id__in=[item.id for item in batch]).delete()
+        processed += len(batch)
+
+    return processed
+
+def index_shard(task):
+    '''Indexes the objects of one model with the given pks into this
+    process's shard, under the directory shards, and returns the number of
+    objects indexed. Runs in the worker processes of rebuild_index().
+    '''
+    app_label, model_name, pks, shards = task
+    index = site.get_index(get_model(app_label, model_name))
+    settings.HAYSTACK_XAPIAN_PATH = os.path.join(shards, str(os.getpid()))
+    objects = list(index.index_queryset().filter(pk__in=pks))
+    index.backend.update(index, objects)
+    return len(objects)
+
+def merge_shards(shards, destination):
+    '''Combines the Xapian databases in the list shards into a new
+    database at destination.
+    '''
+    import xapian
+
+    if shards and hasattr(xapian, 'Compactor'):
+        compactor = xapian.Compactor()
+        for shard in shards:
+            compactor.add_source(shard)
+        compactor.set_destdir(destination)
+        compactor.compact()
+        return
+
+    # Older bindings can't compact, so copy the documents across
+    database = xapian.WritableDatabase(destination, xapian.DB_CREATE_OR_OPEN)
+    for shard in shards:
+        source = xapian.Database(shard)
+        for posting in source.postlist(''):
+            database.add_document(source.get_document(posting.docid))
+    database.flush()
+
+def swap_index(path, index):
+    '''Makes the index directory index live at path, and deletes the index
+    it replaces.
+
+    path is a symbolic link to the live index. A new link is made beside it
+    and renamed over it, which is atomic, so searches always find a
+    complete index. The first time, path is still a directory and has to
+    be moved aside before the link takes its place.
+    '''
+    old = None
+    if os.path.islink(path):
+        old = os.path.realpath(path)
+    elif os.path.exists(path):
+        old = index + '.old'
+        os.rename(path, old)
+
+    link = path + '.swap'
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(index), link)
+    os.rename(link, path)
+
+    if old:
+        shutil.rmtree(old, ignore_errors=True)
+
+def rebuild_index(workers=None, chunk_size=None):
+    '''Rebuilds the whole Xapian index and returns the number of objects
+    indexed.
+
+    Each model's objects are split into chunks of chunk_size that a pool
+    of workers prepares and indexes in parallel. Every worker writes to a
+    private shard, as a Xapian database can only have one writer. The
+    shards are then merged into a new index directory beside the live one,
+    which swap_index() puts in its place.
+    '''
+    workers = workers or cpu_count()
+    chunk_size = chunk_size or app_settings.REINDEX_CHUNK_SIZE
+    path = settings.HAYSTACK_XAPIAN_PATH.rstrip(os.sep)
+    directory, name = os.path.split(path)
+    # The new index sits beside the live one, so the link to it can be
+    # relative and both stay on one filesystem
+    work = tempfile.mkdtemp(dir=directory)
+    shards = os.path.join(work, 'shards')
+    index = tempfile.mkdtemp(prefix=name + '.', dir=directory)
+
+    try:
+        os.mkdir(shards)
+        tasks = []
+        for model, model_index in site.get_indexes().items():
+            pks = list(model_index.index_queryset().values_list('pk', flat=True))
+            for i in range(0, len(pks), chunk_size):
+                tasks.append((model._meta.app_label, model._meta.object_name,
+                              pks[i:i + chunk_size], shards))
+
+        if workers > 1 and len(tasks) > 1:
+            # Each process must open its own database connection
+            connection.close()
+            pool = Pool(min(workers, len(tasks)))
+            try:
+                counts = pool.map(index_shard, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            try:
+                counts = [index_shard(task) for task in tasks]
+            finally:
+                settings.HAYSTACK_XAPIAN_PATH = path
+
+        merge_shards([os.path.join(shards, shard)
+                      for shard in sorted(os.listdir(shards))], index)
+        swap_index(path, index)
+    except:
+        shutil.rmtree(index, ignore_errors=True)
+        raise
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    return sum(counts)
@@ -160,6 +160,7 @@ INSTALLED_APPS = (
     'registration',
     'tagging',
     'haystack',    
+    'searchqueue',
     'copyright',
     'credit',
     'relatedcontent',
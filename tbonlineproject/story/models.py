@@ -3,12 +3,15 @@
 import datetime
 
 from django.db import models    
+from django.db.models.signals import post_save, post_delete
 from django.contrib.contenttypes import generic
 from django.utils.translation import ugettext_lazy as _
 
 from tagging.models import TaggedItem 
 from credit.models import OrderedCredit 
 from post.models import BasicPost
+from post.utils import get_unique_slug, save_with_unique_slug
+from post import caching
 from enhancedtext.fields import EnhancedTextField
 
 
@@ -51,6 +54,16 @@ class Story(models.Model):
     
     def describe(self):
         return self.description
+
+    def _get_unique_slug(self):
+        '''Makes slug unique, if it is not already, and returns it as a string.
+        '''
+        return get_unique_slug(self)
+
+    def save(self, *args, **kwargs):
+        # Make the slug unique
+        save_with_unique_slug(self,
+                lambda: super(Story, self).save(*args, **kwargs))
     
     @models.permalink
     def get_absolute_url(self):
@@ -96,4 +109,14 @@ class OrderedPost(models.Model):
     class Meta:
         verbose_name = _('ordered post')
         verbose_name_plural = _('ordered posts')
-        ordering = ['story', 'position']
\ No newline at end of file
+        ordering = ['story', 'position']
+
+
+def invalidate_story_caches(sender, **kwargs):
+    '''Signal handler that makes cached story pages stale.
+    '''
+    caching.bump_generation()
+
+for model in [Story, OrderedPost]:
+    post_save.connect(invalidate_story_caches, sender=model)
+    post_delete.connect(invalidate_story_caches, sender=model)
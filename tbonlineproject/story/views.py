@@ -6,15 +6,20 @@ from django.views.generic import ListView, DetailView, DateDetailView, RedirectV
 from django.contrib import messages
 from django.utils.translation import ugettext_lazy as _
 from django.core.urlresolvers import reverse
+from django.utils.decorators import method_decorator
 
 from post import app_settings
+from post import caching
 from post.models import BasicPost
+from post.views import ConditionalViewMixin, ConditionalDetailViewMixin, \
+    latest_modified
 
 from models import Story
 
-class StoryListView(ListView):
+class StoryListView(ConditionalViewMixin, ListView):
     context_object_name = 'stories'
     paginate_by = app_settings.POSTS_PER_PAGE
+    last_modified_fields = ('last_modified', 'date_published')
 
     def get_queryset(self):
         return Story.objects.filter(date_published__lte=datetime.datetime.now())
@@ -27,10 +32,23 @@ class StoryDetailViewMixin(object):
         return Story.objects.filter(date_published__lte=datetime.datetime.now())
 
 
-class StoryDateDetailView(StoryDetailViewMixin, DateDetailView):
+class StoryDateDetailView(ConditionalDetailViewMixin, StoryDetailViewMixin,
+                          DateDetailView):
     date_field = "date_published"
     month_format = "%m"
 
+    def get_last_modified(self):
+        '''The story's page changes when the story or any of its posts do.
+        '''
+        story = self.get_object()
+        return max([d for d in [story.last_modified,
+                                latest_modified(story.posts.all())]
+                    if d])
+
+    @method_decorator(caching.cache_anonymous_response('story_detail'))
+    def dispatch(self, *args, **kwargs):
+        return super(StoryDateDetailView, self).dispatch(*args, **kwargs)
+
 class StoryDetailView(StoryDetailViewMixin, DetailView):                                  
     pass
 
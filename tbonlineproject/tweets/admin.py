@@ -1,5 +1,11 @@
 from django.contrib import admin
-from tweets.models import TwitterUsername, Hashtag
+from tweets.models import TwitterUsername, Hashtag, Tweet
+
+class TweetAdmin(admin.ModelAdmin):
+    search_fields = ('text', 'from_user',)
+    list_display = ('id', 'from_user', 'text', 'created_at',)
+    list_filter = ('username',)
 
 admin.site.register(TwitterUsername)
 admin.site.register(Hashtag)
+admin.site.register(Tweet, TweetAdmin)
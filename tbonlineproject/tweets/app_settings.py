@@ -0,0 +1,10 @@
+from django.conf import settings
+
+# Number of tweets shown by the recover_tweets template tag
+TWEETS_SHOWN = getattr(settings, 'TWEETS_SHOWN', 5)
+
+# Number of the most recent tweets kept in the database by gettweets
+TWEETS_KEPT = getattr(settings, 'TWEETS_KEPT', 100)
+
+# Tweets asked for per account and run of gettweets
+TWEETS_PER_QUERY = getattr(settings, 'TWEETS_PER_QUERY', 100)
@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tweets.models import TwitterUsername
+from tweets.utils import fetch_tweets, prune_tweets
+
+class Command(BaseCommand):
+    args = '<username username ...>'
+    help = 'Retrieves new tweets for all Twitter accounts, or specific ' \
+           'accounts if any are specified, for the recover_tweets tag. ' \
+           'Run it on a schedule.'
+
+    def handle(self, *args, **options):
+        accounts = []
+
+        if len(args):
+            for username in args:
+                try:
+                    accounts.append(TwitterUsername.objects.get(username=username))
+                except TwitterUsername.DoesNotExist:
+                    raise CommandError('Twitter username "%s" does not exist' % username)
+        else:
+            accounts = TwitterUsername.objects.all()
+
+        for account in accounts:
+            try:
+                added = fetch_tweets(account)
+            except:
+                self.stdout.write('Error retrieving tweets for %s: %s %s\n' % (account.username, sys.exc_info()[0], sys.exc_info()[1]))
+            else:
+                self.stdout.write('Retrieved %d new tweets for "%s"\n' % (added, account.username))
+
+        pruned = prune_tweets()
+        if pruned:
+            self.stdout.write('Deleted %d old tweets\n' % pruned)
@@ -0,0 +1,50 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding model 'TwitterUsername'
+        db.create_table('tweets_twitterusername', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('username', self.gf('django.db.models.fields.CharField')(max_length=20)),
+        ))
+        db.send_create_signal('tweets', ['TwitterUsername'])
+
+        # Adding model 'Hashtag'
+        db.create_table('tweets_hashtag', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('username', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['tweets.TwitterUsername'])),
+            ('tag', self.gf('django.db.models.fields.CharField')(max_length=140, null=True, blank=True)),
+        ))
+        db.send_create_signal('tweets', ['Hashtag'])
+
+
+    def backwards(self, orm):
+        
+        # Deleting model 'TwitterUsername'
+        db.delete_table('tweets_twitterusername')
+
+        # Deleting model 'Hashtag'
+        db.delete_table('tweets_hashtag')
+
+
+    models = {
+        'tweets.hashtag': {
+            'Meta': {'object_name': 'Hashtag'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'tag': ('django.db.models.fields.CharField', [], {'max_length': '140', 'null': 'True', 'blank': 'True'}),
+            'username': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['tweets.TwitterUsername']"})
+        },
+        'tweets.twitterusername': {
+            'Meta': {'object_name': 'TwitterUsername'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'username': ('django.db.models.fields.CharField', [], {'max_length': '20'})
+        }
+    }
+
+    complete_apps = ['tweets']
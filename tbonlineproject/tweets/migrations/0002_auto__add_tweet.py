@@ -0,0 +1,56 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding model 'Tweet'
+        db.create_table('tweets_tweet', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('username', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['tweets.TwitterUsername'])),
+            ('tweet_id', self.gf('django.db.models.fields.BigIntegerField')(unique=True)),
+            ('from_user', self.gf('django.db.models.fields.CharField')(max_length=20)),
+            ('profile_image_url', self.gf('django.db.models.fields.URLField')(max_length=200, blank=True)),
+            ('text', self.gf('django.db.models.fields.TextField')()),
+            ('created_at', self.gf('django.db.models.fields.DateTimeField')(db_index=True)),
+            ('date_added', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, blank=True)),
+        ))
+        db.send_create_signal('tweets', ['Tweet'])
+
+
+    def backwards(self, orm):
+        
+        # Deleting model 'Tweet'
+        db.delete_table('tweets_tweet')
+
+
+    models = {
+        'tweets.hashtag': {
+            'Meta': {'object_name': 'Hashtag'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'tag': ('django.db.models.fields.CharField', [], {'max_length': '140', 'null': 'True', 'blank': 'True'}),
+            'username': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['tweets.TwitterUsername']"})
+        },
+        'tweets.tweet': {
+            'Meta': {'ordering': "['-created_at']", 'object_name': 'Tweet'},
+            'created_at': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True'}),
+            'date_added': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'from_user': ('django.db.models.fields.CharField', [], {'max_length': '20'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'profile_image_url': ('django.db.models.fields.URLField', [], {'max_length': '200', 'blank': 'True'}),
+            'text': ('django.db.models.fields.TextField', [], {}),
+            'tweet_id': ('django.db.models.fields.BigIntegerField', [], {'unique': 'True'}),
+            'username': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['tweets.TwitterUsername']"})
+        },
+        'tweets.twitterusername': {
+            'Meta': {'object_name': 'TwitterUsername'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'username': ('django.db.models.fields.CharField', [], {'max_length': '20'})
+        }
+    }
+
+    complete_apps = ['tweets']
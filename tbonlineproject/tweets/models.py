@@ -21,3 +21,22 @@ class Hashtag(models.Model):
         
     def __unicode__(self):
         return '%d-%s' % (self.id, self.tag)
+
+class Tweet(models.Model):
+    '''A tweet found by the gettweets command for one of the accounts.
+    '''
+    username = models.ForeignKey(TwitterUsername)
+    tweet_id = models.BigIntegerField(unique=True)
+    from_user = models.CharField(max_length=20)
+    profile_image_url = models.URLField(verify_exists=False, blank=True)
+    text = models.TextField()
+    created_at = models.DateTimeField(db_index=True)
+    date_added = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = _('Tweet')
+        verbose_name_plural = _('Tweets')
+
+    def __unicode__(self):
+        return u'%s: %s' % (self.from_user, self.text)
@@ -5,8 +5,13 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
+import datetime
+
 from django.test import TestCase
 
+from tweets.models import TwitterUsername, Hashtag, Tweet
+from tweets.utils import build_query, fetch_tweets, prune_tweets
+
 
 class SimpleTest(TestCase):
     def test_basic_addition(self):
@@ -14,3 +19,56 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class Result(object):
+    def __init__(self, id, text, created_at):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        self.from_user = 'tbonline'
+        self.profile_image_url = 'http://example.com/tbonline.png'
+
+
+class StubSearch(object):
+    '''Stands in for tweepy.api.search, honouring since_id.
+    '''
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return [r for r in self.results if r.id > kwargs.get('since_id', 0)]
+
+
+class TweetsTest(TestCase):
+
+    def setUp(self):
+        self.account = TwitterUsername.objects.create(username='tbonline')
+        now = datetime.datetime(2012, 1, 2, 10, 0)
+        self.search = StubSearch([Result(i, 'Tweet %d' % i,
+                                         now + datetime.timedelta(minutes=i))
+                                  for i in range(1, 4)])
+
+    def testBuildQuery(self):
+        self.assertEqual(build_query(self.account), 'from:tbonline')
+        Hashtag.objects.create(username=self.account, tag='tb')
+        Hashtag.objects.create(username=self.account, tag='mdrtb')
+        self.assertEqual(build_query(self.account),
+                         'from:tbonline AND #tb OR #mdrtb')
+        Hashtag.objects.create(username=self.account, tag='')
+        self.assertEqual(build_query(self.account), 'from:tbonline')
+
+    def testFetchTweets(self):
+        self.assertEqual(fetch_tweets(self.account, self.search), 3)
+        self.assertEqual([t.tweet_id for t in Tweet.objects.all()], [3, 2, 1])
+
+        self.search.results.append(Result(4, 'Tweet 4',
+                                          datetime.datetime(2012, 1, 3)))
+        self.assertEqual(fetch_tweets(self.account, self.search), 1)
+        self.assertEqual(self.search.calls[-1]['since_id'], 3)
+        self.assertEqual(Tweet.objects.count(), 4)
+
+        self.assertEqual(prune_tweets(2), 2)
+        self.assertEqual([t.tweet_id for t in Tweet.objects.all()], [4, 3])
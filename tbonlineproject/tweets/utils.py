@@ -0,0 +1,59 @@
+'''Utility functions for the tweets app.
+'''
+
+import tweepy
+
+from django.db.models import Max
+
+from tweets import app_settings
+from tweets.models import Tweet
+
+def build_query(account):
+    '''Returns the Twitter search query for an account's tweets, limited to
+    its hashtags unless it has none or an empty one.
+    '''
+    query = 'from:%s' % account.username
+    tags = [hashtag.tag for hashtag in account.hashtag_set.all()]
+    if tags and '' not in tags and None not in tags:
+        query = '%s AND %s' % (query,
+                               ' OR '.join(['#%s' % tag for tag in tags]))
+    return query
+
+def fetch_tweets(account, search=None):
+    '''Stores the account's tweets that are newer than the ones already
+    stored. search is the Twitter search function, tweepy.api.search unless
+    another is given. Returns the number of tweets added.
+    '''
+    if search is None:
+        search = tweepy.api.search
+    kwargs = {'q': build_query(account), 'rpp': app_settings.TWEETS_PER_QUERY}
+    since_id = Tweet.objects.filter(username=account).\
+                    aggregate(Max('tweet_id'))['tweet_id__max']
+    if since_id:
+        kwargs['since_id'] = since_id
+
+    results = search(**kwargs)
+    known = set(Tweet.objects.filter(
+                    tweet_id__in=[result.id for result in results]).\
+                        values_list('tweet_id', flat=True))
+    added = 0
+    for result in results:
+        if result.id in known:
+            continue
+        Tweet.objects.create(username=account, tweet_id=result.id,
+                    from_user=result.from_user,
+                    profile_image_url=getattr(result, 'profile_image_url', ''),
+                    text=result.text, created_at=result.created_at)
+        known.add(result.id)
+        added += 1
+    return added
+
+def prune_tweets(keep=None):
+    '''Deletes all but the keep most recent tweets.
+    '''
+    if keep is None:
+        keep = app_settings.TWEETS_KEPT
+    ids = list(Tweet.objects.values_list('id', flat=True)[keep:])
+    if ids:
+        Tweet.objects.filter(id__in=ids).delete()
+    return len(ids)
@@ -1,16 +1,23 @@
+import datetime
+
 from django.conf.urls.defaults import patterns, include, url
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.sitemaps import FlatPageSitemap
+from django.contrib.sitemaps.views import sitemap
+from django.views.decorators.http import condition
 
 from contact_form.views import contact_form
 
-from post.views import PublishedFrontPagePostsView
+from post.views import PublishedFrontPagePostsView, latest_modified, \
+    latest_post_modified, generation_etag
 
 from post.forms import EnhancedContactForm
 from post.sitemap import PostSitemap
 from story.sitemap import StorySitemap
 from gallery.sitemap import ImageSitemap
+from story.models import Story
+from gallery.models import Image
 
 admin.autodiscover()
 
@@ -21,6 +28,23 @@ sitemaps = {
     'image': ImageSitemap 
 }
 
+def sitemap_last_modified(request, *args, **kwargs):
+    '''Latest change to any of the posts, stories and images in the sitemap.
+    Flat pages have no modification date and are not taken into account.
+    '''
+    dates = [latest_post_modified(request),
+             latest_modified(Story.objects.filter(
+                                date_published__lte=datetime.datetime.now()),
+                             'last_modified', 'date_published'),
+             latest_modified(Image.objects.all())]
+    dates = [d for d in dates if d]
+    if dates:
+        return max(dates)
+    return None
+
+def sitemap_etag(request, *args, **kwargs):
+    return generation_etag(sitemap_last_modified(request))
+
 urlpatterns = patterns('',
     # Examples:
     url(r'^$', PublishedFrontPagePostsView.as_view(template_name = 'index.html'), 
@@ -39,7 +63,9 @@ urlpatterns = patterns('',
     (r'^tb/', include('tb.urls')),
     url(r'^contact/$', contact_form, {'form_class': EnhancedContactForm}, name='contact'),                            
     (r'^contact/', include('contact_form.urls')),
-    (r'^sitemap\.xml$', 'django.contrib.sitemaps.views.sitemap', {'sitemaps': sitemaps}),
+    (r'^sitemap\.xml$', condition(etag_func=sitemap_etag,
+                                   last_modified_func=sitemap_last_modified)
+        (sitemap), {'sitemaps': sitemaps}),
         
     (r'^grappelli/', include('grappelli.urls')),
     (r'^admin/filebrowser/', include('filebrowser.urls')),